@@ -0,0 +1,143 @@
+"""图表构建与序列化基准
+
+对比每次从头构建 go.Figure 与使用缓存骨架只填数据两种方式，按
+st.plotly_chart 的路径（转字典后序列化为 JSON）计算单次耗时，并校验两者
+输出一致。任一图表加速比低于阈值（默认 2 倍）时以非零状态退出。
+
+用法::
+
+    python benchmarks/bench_figures.py --iterations 500
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import plotly.graph_objects as go  # noqa: E402
+import plotly.io as pio  # noqa: E402
+import plotly.tools  # noqa: E402
+
+from sections.daily import FORTUNE_LEVELS, TREND_CHART, TREND_COLUMNS  # noqa: E402
+from utils.bazi_calculator import ELEMENT_COLORS  # noqa: E402
+from utils.figures import ELEMENTS_PIE, STROKES_BAR  # noqa: E402
+
+ELEMENTS = {"金": 20.0, "木": 30.0, "水": 10.0, "火": 25.0, "土": 15.0}
+STROKES = {"张": 11, "三": 3, "丰": 4}
+DATES = tuple(date(2024, 1, 1) + timedelta(days=i) for i in range(7))
+LEVELS = {col: ("大吉", "吉", "平", "凶", "大凶", "吉", "平") for col in TREND_COLUMNS}
+
+
+def _pie_direct():
+    fig = go.Figure(go.Pie(
+        labels=list(ELEMENTS), values=list(ELEMENTS.values()),
+        marker=dict(colors=[ELEMENT_COLORS[e] for e in ELEMENTS])
+    ))
+    fig.update_layout(title='五行分布')
+    return fig
+
+
+def _pie_template():
+    return ELEMENTS_PIE.fill({
+        "labels": list(ELEMENTS), "values": list(ELEMENTS.values()),
+        "marker": {"colors": [ELEMENT_COLORS[e] for e in ELEMENTS]},
+    })
+
+
+def _bar_direct():
+    fig = go.Figure(data=[go.Bar(
+        name='笔画', x=list(STROKES), y=list(STROKES.values()),
+        text=list(STROKES.values()), textposition='auto',
+    )])
+    fig.update_layout(title='姓名笔画分布')
+    return fig
+
+
+def _bar_template():
+    return STROKES_BAR.fill({
+        "x": list(STROKES), "y": list(STROKES.values()), "text": [str(value) for value in STROKES.values()]
+    })
+
+
+def _trend_direct():
+    fig = go.Figure()
+    for col in TREND_COLUMNS:
+        fig.add_trace(go.Scatter(
+            x=DATES, y=[FORTUNE_LEVELS[level] for level in LEVELS[col]], name=col,
+            mode='lines+markers',
+            hovertemplate=col + ": %{text}<br>日期: %{x|%Y-%m-%d}<extra></extra>",
+            text=LEVELS[col]
+        ))
+    fig.update_layout(
+        xaxis_title="日期", yaxis_title="运势指数", hovermode="x unified",
+        yaxis=dict(ticktext=list(FORTUNE_LEVELS.keys()), tickvals=list(FORTUNE_LEVELS.values()), range=[0.5, 5.5])
+    )
+    return fig
+
+
+def _trend_template():
+    return TREND_CHART.fill(*(
+        {"x": DATES, "y": [FORTUNE_LEVELS[level] for level in LEVELS[col]], "text": LEVELS[col]}
+        for col in TREND_COLUMNS
+    ))
+
+
+CHARTS = {
+    "elements_pie": (_pie_direct, _pie_template),
+    "strokes_bar": (_bar_direct, _bar_template),
+    "fortune_trend": (_trend_direct, _trend_template),
+}
+
+
+def _spec(build) -> str:
+    """与 st.plotly_chart 相同的处理：转为字典后序列化"""
+    figure = plotly.tools.return_figure_from_figure_or_data(build(), validate_figure=True)
+    return pio.to_json(figure, validate=False)
+
+
+def _per_call_us(build, iterations: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        _spec(build)
+    return (time.perf_counter_ns() - start) / iterations / 1000
+
+
+def measure(iterations: int) -> dict:
+    """返回每个图表两种方式的单次耗时（微秒）与加速比"""
+    results = {}
+    for name, (direct, template) in CHARTS.items():
+        if json.loads(_spec(direct)) != json.loads(_spec(template)):
+            raise AssertionError(f"{name}: 骨架填充结果与直接构建不一致")
+        direct_us = min(_per_call_us(direct, iterations) for _ in range(3))
+        template_us = min(_per_call_us(template, iterations) for _ in range(3))
+        results[name] = {
+            "direct_us": round(direct_us, 1),
+            "template_us": round(template_us, 1),
+            "speedup": round(direct_us / template_us, 1),
+        }
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="图表构建与序列化基准")
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--min-speedup", type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    results = measure(args.iterations)
+    print(f"{'chart':<16} {'direct_us':>10} {'template_us':>12} {'speedup':>8}")
+    for name, row in results.items():
+        print(f"{name:<16} {row['direct_us']:>10.1f} {row['template_us']:>12.1f} {row['speedup']:>7.1f}x")
+
+    slow = [name for name, row in results.items() if row["speedup"] < args.min_speedup]
+    if slow:
+        print(f"加速比低于 {args.min_speedup} 倍: {', '.join(slow)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
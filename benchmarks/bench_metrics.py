@@ -0,0 +1,70 @@
+"""埋点开销基准
+
+对比空函数在装饰前后的单次调用耗时，以及上下文管理器形式的开销，
+超过阈值（默认 3 微秒）时以非零状态退出。
+
+用法::
+
+    python benchmarks/bench_metrics.py --iterations 200000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.metrics import MetricsRegistry, _Timer  # noqa: E402
+
+
+def _noop(x):
+    return x
+
+
+def _per_call_ns(func, iterations: int) -> float:
+    start = time.perf_counter_ns()
+    for i in range(iterations):
+        func(i)
+    return (time.perf_counter_ns() - start) / iterations
+
+
+def measure_overhead(iterations: int) -> dict:
+    """返回装饰器与上下文管理器的单次额外开销（纳秒）"""
+    registry = MetricsRegistry()
+    decorated = _Timer(registry.histogram("bench.decorated"))(_noop)
+    hist = registry.histogram("bench.context")
+
+    def with_context(x):
+        with _Timer(hist):
+            return x
+
+    baseline = min(_per_call_ns(_noop, iterations) for _ in range(3))
+    decorator = min(_per_call_ns(decorated, iterations) for _ in range(3))
+    context = min(_per_call_ns(with_context, iterations) for _ in range(3))
+    return {
+        "baseline_ns": round(baseline, 1),
+        "decorator_overhead_ns": round(decorator - baseline, 1),
+        "context_overhead_ns": round(context - baseline, 1),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="埋点开销基准")
+    parser.add_argument("--iterations", type=int, default=200_000)
+    parser.add_argument("--max-overhead-us", type=float, default=3.0)
+    args = parser.parse_args(argv)
+
+    result = measure_overhead(args.iterations)
+    for key, value in result.items():
+        print(f"{key:<24} {value:>10.1f}")
+
+    limit_ns = args.max_overhead_us * 1000
+    worst = max(result["decorator_overhead_ns"], result["context_overhead_ns"])
+    if worst > limit_ns:
+        print(f"埋点开销 {worst:.0f}ns 超过上限 {limit_ns:.0f}ns", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""端到端重跑压测工具
+
+基于 ``streamlit.testing.v1.AppTest``，在多个进程中模拟大量会话，
+依次驱动 ``main.py`` 的六个分析页面并记录每次重跑的延迟、
+每个会话的内存峰值以及总吞吐量，结果写入可在版本之间对比的 JSON 报告。
+
+用法::
+
+    python benchmarks/load_test.py --sessions 40 --workers 4 --output load_report.json
+    python benchmarks/load_test.py --compare old_report.json --output new_report.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, time as dtime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+SCRIPT = ROOT / "main.py"
+
+PAGES = ["八字分析", "生肖运势", "姓名学分析", "紫薇斗数", "塔罗牌占卜", "节日运势"]
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def _birth_inputs(at) -> None:
+    at.date_input[0].set_value(date(1990, 5, 17))
+    at.time_input[0].set_value(dtime(8, 30))
+    at.radio[0].set_value("女")
+
+
+# 每个页面的脚本化输入：(输入设置函数, 触发分析的按钮 key)
+SCENARIOS: Dict[str, tuple] = {
+    "八字分析": (_birth_inputs, "bazi_analysis"),
+    "生肖运势": (lambda at: at.number_input[0].set_value(1988), "zodiac_analysis"),
+    "姓名学分析": (lambda at: at.text_input[0].input("张伟"), "name_analysis"),
+    "紫薇斗数": (_birth_inputs, "ziwei_analysis"),
+    "塔罗牌占卜": (lambda at: at.radio[0].set_value("五张牌阵（完整解读）"), "tarot_reading"),
+    "节日运势": (lambda at: None, "festival_fortune"),
+}
+
+
+def _timed_run(at, timeout: float) -> float:
+    """执行一次重跑并返回耗时（毫秒），脚本异常时抛出"""
+    start = time.perf_counter()
+    at.run(timeout=timeout)
+    elapsed = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return elapsed
+
+
+def _run_session(pages: List[str], timeout: float) -> Dict:
+    """模拟单个用户会话：首次加载后依次进入每个页面并点击分析按钮"""
+    from streamlit.testing.v1 import AppTest
+
+    samples: Dict[str, Dict[str, List[float]]] = {}
+    at = AppTest.from_file(str(SCRIPT), default_timeout=timeout)
+    reruns = 1
+    load_ms = _timed_run(at, timeout)
+
+    for page in pages:
+        set_inputs, button_key = SCENARIOS[page]
+        page_samples = samples.setdefault(page, {"select": [], "action": []})
+
+        at.selectbox(key="analysis_type").set_value(page)
+        page_samples["select"].append(_timed_run(at, timeout))
+
+        set_inputs(at)
+        at.button(key=button_key).click()
+        page_samples["action"].append(_timed_run(at, timeout))
+        reruns += 2
+
+    return {"load_ms": load_ms, "samples": samples, "reruns": reruns}
+
+
+def _worker(worker_id: int, sessions: int, pages: List[str], timeout: float, trace_memory: bool) -> Dict:
+    """在独立进程中顺序运行若干会话，保证内存峰值按会话统计"""
+    os.chdir(ROOT)
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+
+    if trace_memory:
+        tracemalloc.start()
+
+    results = []
+    errors = []
+    for i in range(sessions):
+        if trace_memory:
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+        try:
+            result = _run_session(pages, timeout)
+        except Exception as exc:  # 记录失败会话但不中断压测
+            errors.append(f"worker {worker_id} session {i}: {exc!r}")
+            continue
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            result["peak_kib"] = (peak - base) / 1024
+        results.append(result)
+
+    if trace_memory:
+        tracemalloc.stop()
+
+    # 压测进程由 fork 创建，退出时不会执行 atexit，需主动关闭计算进程池
+    from utils.executor import shutdown_pool
+    shutdown_pool()
+    return {"results": results, "errors": errors}
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    """最近秩法计算百分位数"""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    stats = {}
+    for p in PERCENTILES:
+        rank = max(1, -(-p * len(ordered) // 100))
+        stats[f"p{p}"] = round(ordered[rank - 1], 3)
+    stats["max"] = round(ordered[-1], 3)
+    stats["count"] = len(ordered)
+    return stats
+
+
+def _streamlit_version() -> str:
+    try:
+        import streamlit
+        return streamlit.__version__
+    except ImportError:
+        return "unknown"
+
+
+def run_load_test(sessions: int, workers: int, pages: List[str], timeout: float,
+                  trace_memory: bool = True) -> Dict:
+    """并行运行压测并汇总报告"""
+    per_worker = [sessions // workers + (1 if i < sessions % workers else 0) for i in range(workers)]
+
+    results, errors = [], []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_worker, i, n, pages, timeout, trace_memory)
+            for i, n in enumerate(per_worker) if n
+        ]
+        for future in as_completed(futures):
+            outcome = future.result()
+            results.extend(outcome["results"])
+            errors.extend(outcome["errors"])
+    wall = time.perf_counter() - start
+
+    page_report = {}
+    for page in pages:
+        page_report[page] = {
+            step: _percentiles([ms for r in results for ms in r["samples"].get(page, {}).get(step, [])])
+            for step in ("select", "action")
+        }
+
+    reruns = sum(r["reruns"] for r in results)
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "streamlit": _streamlit_version(),
+            "sessions": sessions,
+            "workers": workers,
+            "pages": pages,
+        },
+        "initial_load_ms": _percentiles([r["load_ms"] for r in results]),
+        "pages": page_report,
+        "throughput": {
+            "wall_s": round(wall, 3),
+            "completed_sessions": len(results),
+            "reruns": reruns,
+            "reruns_per_s": round(reruns / wall, 3) if wall else 0.0,
+            "sessions_per_s": round(len(results) / wall, 3) if wall else 0.0,
+        },
+        "errors": errors,
+    }
+    if trace_memory:
+        report["peak_memory_kib"] = _percentiles([r["peak_kib"] for r in results])
+    return report
+
+
+def _flatten(report: Dict, prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in report.items():
+        if key in ("meta", "errors"):
+            continue
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, path + "."))
+        elif isinstance(value, (int, float)):
+            flat[path] = value
+    return flat
+
+
+def compare_reports(old: Dict, new: Dict) -> List[str]:
+    """逐项对比两份报告，返回可读的差异行"""
+    old_flat, new_flat = _flatten(old), _flatten(new)
+    lines = []
+    for key in sorted(set(old_flat) | set(new_flat)):
+        before, after = old_flat.get(key), new_flat.get(key)
+        if before is None or after is None:
+            lines.append(f"{key:<45} {before!s:>12} -> {after!s:>12}")
+            continue
+        delta = (after - before) / before * 100 if before else 0.0
+        lines.append(f"{key:<45} {before:>12.3f} -> {after:>12.3f} ({delta:+.1f}%)")
+    return lines
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="main.py 端到端重跑压测")
+    parser.add_argument("--sessions", type=int, default=24, help="模拟会话总数")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="并行进程数")
+    parser.add_argument("--pages", nargs="+", default=PAGES, choices=PAGES, help="要驱动的页面")
+    parser.add_argument("--timeout", type=float, default=30.0, help="单次重跑超时（秒）")
+    parser.add_argument("--no-memory", action="store_true", help="关闭 tracemalloc 内存统计")
+    parser.add_argument("--output", default="load_report.json", help="报告输出路径")
+    parser.add_argument("--compare", help="与之对比的旧报告路径")
+    args = parser.parse_args(argv)
+
+    report = run_load_test(args.sessions, max(1, args.workers), args.pages, args.timeout,
+                           trace_memory=not args.no_memory)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, sort_keys=True)
+    print(f"报告已写入 {args.output}")
+
+    for error in report["errors"]:
+        print(f"错误: {error}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print("\n".join(compare_reports(baseline, report)))
+
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,9 @@
+# 分析类型 -> 页面模块，选中后才按需导入
+PAGES = {
+    "八字分析": "sections.bazi",
+    "生肖运势": "sections.zodiac",
+    "姓名学分析": "sections.name",
+    "紫薇斗数": "sections.ziwei",
+    "塔罗牌占卜": "sections.tarot",
+    "节日运势": "sections.festival",
+}
@@ -0,0 +1,115 @@
+import os
+
+import streamlit as st
+
+from utils.auth import keys_match
+from utils.memory import approx_sizeof, get_monitor, process_rss_bytes, start_tracing, stop_tracing, top_allocators
+from utils.metrics import REGISTRY
+from utils.profiler import recent_profiles, top_functions
+
+
+def is_admin_request(query_params) -> bool:
+    """仅当 ?admin= 与环境变量 SUANMING_ADMIN_KEY 一致时进入管理页面"""
+    expected = os.environ.get("SUANMING_ADMIN_KEY")
+    provided = query_params.get("admin")
+    if not expected or not provided:
+        return False
+    return keys_match(provided, expected)
+
+
+def render():
+    """隐藏的管理页面：展示埋点统计与性能剖析结果"""
+    st.title("🛠️ 运行指标")
+    metrics_tab, profile_tab, memory_tab = st.tabs(["耗时统计", "性能剖析", "内存"])
+    with metrics_tab:
+        _render_metrics()
+    with profile_tab:
+        _render_profiles()
+    with memory_tab:
+        _render_memory()
+
+
+def _render_metrics():
+    summaries = REGISTRY.summaries()
+    if not summaries:
+        st.info("暂无埋点数据")
+    else:
+        st.subheader("耗时统计（按总耗时排序）")
+        st.dataframe(summaries, use_container_width=True, hide_index=True)
+
+    prometheus_text = REGISTRY.to_prometheus()
+    with st.expander("Prometheus 文本"):
+        st.code(prometheus_text, language="text")
+    st.download_button("下载 metrics.txt", prometheus_text, file_name="metrics.txt")
+
+    if st.button("清空统计", key="admin_reset_metrics"):
+        REGISTRY.reset()
+        st.rerun()
+
+
+def _render_profiles():
+    profiles = recent_profiles()
+    if not profiles:
+        st.info("暂无剖析记录，使用 ?profile=1&profile_key=... 访问页面以生成")
+        return
+
+    names = [p.name for p in profiles]
+    selected = st.multiselect("选择剖析记录", names, default=names[:5], key="admin_profiles")
+    chosen = [p for p in profiles if p.name in selected]
+    if chosen:
+        st.subheader("最耗时的函数（按自身采样数）")
+        st.dataframe(top_functions(chosen), use_container_width=True, hide_index=True)
+
+    latest = profiles[0]
+    st.download_button(f"下载 {latest.name}", latest.read_bytes(), file_name=latest.name)
+
+
+def _session_states() -> list:
+    """所有活跃会话的 session_state 大小；取不到运行时信息时只统计当前会话"""
+    try:
+        from streamlit.runtime import Runtime
+
+        sessions = Runtime.instance()._session_mgr.list_active_sessions()
+        states = [(info.session.id, info.session.session_state.filtered_state) for info in sessions]
+    except Exception:
+        states = [("current", st.session_state.to_dict())]
+
+    rows = []
+    for session_id, items in states:
+        rows.append({
+            "session": session_id,
+            "keys": len(items),
+            "kib": round(approx_sizeof(items) / 1024, 1),
+            "largest": max(items, key=lambda k: approx_sizeof(items[k]), default=""),
+        })
+    return sorted(rows, key=lambda row: row["kib"], reverse=True)
+
+
+def _render_memory():
+    monitor = get_monitor()
+    rss = process_rss_bytes()
+    cols = st.columns(3)
+    cols[0].metric("进程常驻内存", f"{rss / 2 ** 20:.1f} MB" if rss is not None else "未知")
+    cols[1].metric("缓存合计", f"{monitor.total_bytes() / 2 ** 20:.2f} MB")
+    cols[2].metric("预算", f"{monitor.budget_bytes / 2 ** 20:.0f} MB" if monitor.budget_bytes > 0 else "不限")
+
+    st.subheader("缓存与表")
+    st.dataframe(monitor.report(), use_container_width=True, hide_index=True)
+    if monitor.budget_bytes > 0 and st.button("立即按预算淘汰", key="admin_enforce_budget"):
+        st.write(monitor.enforce() or "未超出预算")
+
+    st.subheader("会话状态")
+    st.dataframe(_session_states(), use_container_width=True, hide_index=True)
+
+    st.subheader("tracemalloc 分配热点")
+    allocators = top_allocators()
+    if not allocators:
+        st.info("tracemalloc 未开启")
+        if st.button("开启 tracemalloc", key="admin_start_tracing"):
+            start_tracing()
+            st.rerun()
+    else:
+        st.dataframe(allocators, use_container_width=True, hide_index=True)
+        if st.button("关闭 tracemalloc", key="admin_stop_tracing"):
+            stop_tracing()
+            st.rerun()
@@ -0,0 +1,119 @@
+from datetime import date, datetime, time
+from itertools import islice
+from typing import Tuple
+
+import streamlit as st
+from lunar_python import Lunar
+
+from sections.common import markdown_table, page
+from sections.history import record
+from utils.bazi_calculator import (
+    annual_pillars, calculate_bazi, get_day_master_strength, get_five_elements, luck_pillars, pillar_codes
+)
+from utils.canonical import bazi_key, pillars_key
+from utils.figures import ELEMENTS_PIE
+from utils.history import Reading
+from utils.records import Series
+from utils.result_store import cached_result
+
+
+def _show(birth_date: date, birth_time: time, gender: str) -> str:
+    """计算并显示八字分析，返回八字"""
+    # 将日期和时间合并为datetime对象
+    birth_datetime = datetime.combine(birth_date, birth_time)
+
+    # Calculate lunar date
+    lunar = Lunar.fromDate(birth_datetime)
+
+    # Get BaZi
+    bazi_result = cached_result(
+        "bazi", bazi_key(birth_date, birth_time), lambda: calculate_bazi(birth_date, birth_time, gender)
+    )
+    five_elements = cached_result("five_elements", pillars_key(bazi_result), lambda: get_five_elements(bazi_result))
+
+    # Display results
+    st.success("分析完成！")
+
+    # Display BaZi chart
+    st.subheader("八字排盘")
+    st.write(f"农历: {lunar.getYearInChinese()}年{lunar.getMonthInChinese()}月{lunar.getDayInChinese()}")
+    st.write(f"八字: {bazi_result}")
+
+    # Five Elements Chart
+    series = Series.from_mapping(five_elements)
+    st.plotly_chart(ELEMENTS_PIE.fill({"labels": series.labels, "values": series.values}))
+
+    # 日主强弱
+    day_master = get_day_master_strength(bazi_result)
+    st.write(
+        f"日主: {day_master['day_master']}（{day_master['element']}） "
+        f"{day_master['strength']}，得助 {day_master['support']} / 耗泄 {day_master['drain']}"
+    )
+
+    # 大运：只取页面展示的前八步
+    st.subheader("大运")
+    decades = list(islice(luck_pillars(birth_date, birth_time, gender), 8))
+    markdown_table([
+        {"大运": p.pillar, "起运年龄": p.start_age, "起止年份": f"{p.start_year}-{p.end_year}"}
+        for p in decades
+    ])
+
+    # 流年：只展示当前所处大运的十年
+    this_year = datetime.now().year
+    current = next((p for p in decades if p.start_year <= this_year <= p.end_year), None)
+    if current is not None:
+        st.subheader(f"流年（{current.pillar}运）")
+        markdown_table([
+            {"年份": y.year, "年龄": y.age, "流年": y.pillar}
+            for y in annual_pillars(birth_date.year, current.start_year)
+        ])
+    return bazi_result
+
+
+@page("八字分析")
+def render():
+    """八字分析页面"""
+    st.header("八字分析")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        birth_date = st.date_input(
+            "选择出生日期",
+            min_value=datetime(1900, 1, 1),
+            max_value=datetime.now(),
+            value=datetime.now()
+        )
+        birth_time = st.time_input("选择出生时间", datetime.now().time())
+
+    with col2:
+        gender = st.radio("性别", ["男", "女"])
+
+    if st.button("开始分析", key="bazi_analysis"):
+        with st.spinner("正在计算八字..."):
+            bazi_result = _show(birth_date, birth_time, gender)
+
+        # 记住四柱序号，今日运势面板据此切换为个性化日历
+        st.session_state["bazi_codes"] = tuple(pillar_codes(bazi_result))
+
+        record("八字分析", _pack_birth(birth_date, birth_time, gender))
+
+
+def _pack_birth(birth_date: date, birth_time: time, gender: str) -> int:
+    """出生日期（序数）、分钟、性别打包成一个整数，供会话记录保存"""
+    return (birth_date.toordinal() * 1440 + birth_time.hour * 60 + birth_time.minute) * 2 + (gender == "女")
+
+
+def _unpack_birth(value: int) -> Tuple[date, time, str]:
+    value, female = divmod(value, 2)
+    ordinal, minutes = divmod(value, 1440)
+    return date.fromordinal(ordinal), time(minutes // 60, minutes % 60), "女" if female else "男"
+
+
+def title(reading: Reading) -> str:
+    birth_date, birth_time, gender = _unpack_birth(reading.value)
+    return f"{birth_date.isoformat()} {birth_time:%H:%M} {gender}"
+
+
+def replay(reading: Reading) -> None:
+    """按记录的出生时间重新显示八字分析"""
+    _show(*_unpack_birth(reading.value))
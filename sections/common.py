@@ -0,0 +1,34 @@
+from functools import wraps
+from typing import Any, Callable, Mapping, Sequence
+
+import streamlit as st
+
+from utils.metrics import timed
+from utils.profiler import maybe_profile
+
+
+def page(name: str) -> Callable[[Callable], Callable]:
+    """页面渲染函数的装饰器：作为独立 fragment 重跑，记录 page.<name> 耗时，
+    并在 fragment 单独重跑时同样支持按需剖析（?profile=1&profile_key=...）"""
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def profiled(*args, **kwargs):
+            with maybe_profile(st.query_params, name):
+                return func(*args, **kwargs)
+
+        return st.fragment(timed(f"page.{name}")(profiled))
+
+    return decorator
+
+
+def markdown_table(rows: Sequence[Mapping[str, Any]]) -> None:
+    """以 Markdown 表格显示少量行（st.dataframe 会引入 pandas）"""
+    if not rows:
+        return
+    headers = list(rows[0])
+    lines = [
+        "| " + " | ".join(headers) + " |",
+        "|" + "---|" * len(headers),
+    ]
+    lines.extend("| " + " | ".join(str(row[h]) for h in headers) + " |" for row in rows)
+    st.markdown("\n".join(lines))
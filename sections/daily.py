@@ -0,0 +1,167 @@
+import random
+from datetime import datetime, timedelta
+
+import plotly.graph_objects as go
+import streamlit as st
+
+from sections.common import page
+from utils.almanac import next_auspicious
+from utils.daily_fortune import DailyFortune
+from utils.figures import FigureTemplate
+from utils.records import TrendSeries
+
+# 运势等级对应的emoji
+FORTUNE_EMOJIS = {"大吉": "🌟", "吉": "⭐", "平": "⚪", "凶": "⚠️", "大凶": "❌"}
+
+FORTUNE_LEVELS = {"大吉": 5, "吉": 4, "平": 3, "凶": 2, "大凶": 1}
+
+TREND_COLUMNS = ["总运势", "感情运", "事业运", "财运"]
+
+# 择吉日可选的事项
+SELECT_ACTIVITIES = ["搬家", "结婚", "开业", "出行", "签约", "装修", "祈福", "求医"]
+
+
+def _trend_skeleton() -> go.Figure:
+    """七日趋势图的静态部分，数据在每次渲染时填入"""
+    fig = go.Figure()
+    for col in TREND_COLUMNS:
+        fig.add_trace(go.Scatter(
+            name=col,
+            mode='lines+markers',
+            hovertemplate=col + ": %{text}<br>日期: %{x|%Y-%m-%d}<extra></extra>",
+        ))
+
+    fig.update_layout(
+        xaxis_title="日期",
+        yaxis_title="运势指数",
+        hovermode="x unified",
+        yaxis=dict(
+            ticktext=list(FORTUNE_LEVELS.keys()),
+            tickvals=list(FORTUNE_LEVELS.values()),
+            range=[0.5, 5.5]
+        )
+    )
+    return fig
+
+
+TREND_CHART = FigureTemplate(_trend_skeleton)
+
+
+def _personal_calendar(codes: tuple, year: int):
+    """本会话用户某年的个性化运势日历，每人每年只预计算一次"""
+    calendars = st.session_state.setdefault("fortune_calendars", {})
+    key = (codes, year)
+    if key not in calendars:
+        # 只保留当年和跨年所需的日历
+        for stale in [k for k in calendars if k[0] != codes or k[1] < year - 1]:
+            del calendars[stale]
+        calendars[key] = DailyFortune.precompute_calendar(codes, year)
+    return calendars[key]
+
+
+def _personal_trend(codes: tuple, dates) -> dict:
+    """从预计算日历中读取七日运势"""
+    columns = {"总运势": [], "感情运": [], "事业运": [], "财运": []}
+    for day in dates:
+        levels = _personal_calendar(codes, day.year)[day.timetuple().tm_yday - 1]
+        for col, level in zip(columns, levels):
+            columns[col].append(DailyFortune.FORTUNE_LEVELS[level])
+    return columns
+
+
+def _build_dashboard(codes) -> dict:
+    """生成当天的运势面板数据，已排过八字的用户使用个性化日历"""
+    now = datetime.now()
+    dates = [now.date() + timedelta(days=i) for i in range(7)]
+
+    if codes is None:
+        daily_fortune = DailyFortune.get_daily_fortune()
+
+        # 生成随机运势数据
+        columns = {
+            col: [random.choice(list(FORTUNE_LEVELS.keys())) for _ in range(7)]
+            for col in ["总运势", "感情运", "事业运", "财运"]
+        }
+    else:
+        daily_fortune = DailyFortune.get_daily_fortune(now, pillar_codes=codes)
+        columns = _personal_trend(codes, dates)
+
+    return {
+        "date": now.date(),
+        "codes": codes,
+        "fortune": daily_fortune,
+        "trend": TrendSeries.from_columns(dates, columns),
+        "colors": DailyFortune.get_lucky_colors(),
+        "numbers": DailyFortune.get_lucky_numbers(),
+        "directions": DailyFortune.get_lucky_directions(),
+    }
+
+
+def _get_dashboard() -> dict:
+    """同一会话当天只生成一次面板数据，整页重跑时直接复用"""
+    codes = st.session_state.get("bazi_codes")
+    dashboard = st.session_state.get("daily_dashboard")
+    if dashboard is None or dashboard["date"] != datetime.now().date() or dashboard["codes"] != codes:
+        dashboard = _build_dashboard(codes)
+        st.session_state["daily_dashboard"] = dashboard
+    return dashboard
+
+
+@page("今日运势")
+def render():
+    """今日运势面板"""
+    dashboard = _get_dashboard()
+    daily_fortune = dashboard["fortune"]
+
+    # 显示每日运势卡片
+    with st.container():
+        st.subheader("📅 今日运势" + ("（个性化）" if dashboard["codes"] is not None else ""))
+        cols = st.columns(4)
+
+        with cols[0]:
+            st.metric("总运势", f"{FORTUNE_EMOJIS[daily_fortune['overall']]} {daily_fortune['overall']}")
+        with cols[1]:
+            st.metric("感情运", f"{FORTUNE_EMOJIS[daily_fortune['love']]} {daily_fortune['love']}")
+        with cols[2]:
+            st.metric("事业运", f"{FORTUNE_EMOJIS[daily_fortune['career']]} {daily_fortune['career']}")
+        with cols[3]:
+            st.metric("财运", f"{FORTUNE_EMOJIS[daily_fortune['wealth']]} {daily_fortune['wealth']}")
+
+    # 创建运势趋势图
+    trend = dashboard["trend"]
+    st.subheader("📈 七日运势趋势")
+    fig = TREND_CHART.fill(*(
+        {"x": trend.dates, "y": trend.scores(col, FORTUNE_LEVELS), "text": trend.levels[col]}
+        for col in TREND_COLUMNS
+    ))
+
+    st.plotly_chart(fig, use_container_width=True)
+
+    # 显示吉凶提示
+    st.markdown("### 📝 今日提示")
+    for tip in daily_fortune['tips']:
+        st.info(tip)
+
+    # 按黄历查找近期吉日
+    with st.expander("🗓️ 择吉日"):
+        activity = st.selectbox("事项", SELECT_ACTIVITIES, key="almanac_activity")
+        good_day = next_auspicious(activity, dashboard["date"], within=90)
+        if good_day is None:
+            st.write(f"未来 90 天内没有宜{activity}的日子")
+        else:
+            st.write(f"最近宜{activity}的日子：{good_day:%Y-%m-%d}（{(good_day - dashboard['date']).days} 天后）")
+
+    # 显示幸运信息
+    cols = st.columns(3)
+    with cols[0]:
+        st.write("🎨 幸运颜色：", "、".join(dashboard["colors"]))
+    with cols[1]:
+        st.write("🔢 幸运数字：", "、".join(map(str, dashboard["numbers"])))
+    with cols[2]:
+        st.write("🧭 吉利方位：", "、".join(dashboard["directions"]))
+
+    # 显示智慧语录和情感语录
+    st.markdown("### 📖 今日箴言")
+    st.success(daily_fortune['wisdom'])
+    st.markdown("### 💝 情感语录")
+    st.success(daily_fortune['love_quote'])
@@ -0,0 +1,55 @@
+import streamlit as st
+
+from sections.common import page
+from sections.history import record
+from utils.daily_snapshot import get_snapshot
+from utils.history import Reading, new_seed
+from utils.lunar_festival import LunarFestival
+
+
+def _show(festival_name: str, seed: int) -> None:
+    """按种子解读并显示节日运势"""
+    fortune = LunarFestival.get_festival_fortune(festival_name, seed=seed)
+
+    # 显示运势
+    st.markdown("### 节日运势解读")
+    st.markdown(f"""
+    <div style='padding: 20px; border-radius: 10px; background-color: rgba(255,245,238,0.9);'>
+        <h4 style='color: #CD0000;'>总体运势：{fortune['overall']}</h4>
+        <p style='font-size: 1.2em;'>{fortune['fortune']}</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # 显示建议
+    st.subheader("🎋 节日指引")
+    for suggestion in fortune['suggestions']:
+        st.info(suggestion)
+
+
+@page("节日运势")
+def render():
+    """节日运势页面"""
+    st.header("🏮 农历节日运势")
+
+    # 当前节日信息来自全进程共享的每日快照
+    current_festival = get_snapshot().festival
+
+    if current_festival:
+        st.subheader(f"近期节日：{current_festival['name']}")
+        st.write(f"距离节日还有 {current_festival['days_until']} 天")
+        st.write(current_festival['info']['description'])
+
+        if st.button("查看节日运势", key="festival_fortune"):
+            seed = new_seed()
+            with st.spinner("正在解读节日运势..."):
+                _show(current_festival['name'], seed)
+            record("节日运势", text=current_festival['name'], seed=seed)
+
+
+def title(reading: Reading) -> str:
+    return reading.text
+
+
+def replay(reading: Reading) -> None:
+    """用记录的种子重现当次节日运势"""
+    _show(reading.text, reading.seed)
@@ -0,0 +1,65 @@
+import importlib
+from datetime import datetime
+
+import streamlit as st
+
+from sections import PAGES
+from utils.history import Reading, ReadingHistory
+
+
+# 记录中的分析类型以序号保存
+KINDS = tuple(PAGES)
+
+
+def get_history() -> ReadingHistory:
+    """当前会话的占卜记录"""
+    if "reading_history" not in st.session_state:
+        st.session_state["reading_history"] = ReadingHistory()
+    return st.session_state["reading_history"]
+
+
+def record(kind: str, value: int = 0, text: str = None, seed: int = 0) -> Reading:
+    """记录一次占卜；kind 为 PAGES 中的分析类型，回看时由对应页面的 replay() 重新渲染，
+    标题由对应页面的 title() 按记录的输入生成"""
+    return get_history().add(KINDS.index(kind), value, text, seed)
+
+
+def _page(reading: Reading):
+    return importlib.import_module(PAGES[KINDS[reading.kind]])
+
+
+def render_sidebar() -> None:
+    """侧边栏中的会话记录列表，点击后在主区域回看"""
+    history = get_history()
+    if not history:
+        return
+    with st.expander(f"本次会话记录（{len(history)}）"):
+        for reading in history:
+            title = _page(reading).title(reading)
+            label = f"{datetime.fromtimestamp(reading.created):%H:%M} {KINDS[reading.kind]} · {title}"
+            if st.button(label, key=f"history_{reading.created!r}", use_container_width=True):
+                st.session_state["history_replay"] = reading
+
+
+def clear_replay() -> None:
+    """退出回看（切换分析类型时也会调用）"""
+    st.session_state.pop("history_replay", None)
+
+
+def render_replay() -> bool:
+    """回看选中的记录：按记录的输入和种子重新计算并渲染
+
+    回看内容代替当前分析页面显示，两者不会出现在同一次运行中，
+    否则相同的图表会注册重复的元素 ID。返回是否正在回看。
+    """
+    reading = st.session_state.get("history_replay")
+    if reading is None:
+        return False
+    with st.container(border=True):
+        page = _page(reading)
+        st.subheader(f"📜 回看：{KINDS[reading.kind]} · {page.title(reading)}")
+        page.replay(reading)
+        if st.button("关闭回看", key="history_close"):
+            clear_replay()
+            st.rerun()
+    return True
@@ -0,0 +1,73 @@
+import streamlit as st
+
+from sections.common import page
+from sections.history import record
+from utils.bazi_calculator import ELEMENT_COLORS
+from utils.canonical import name_key, name_seed, normalize_name
+from utils.figures import ELEMENTS_PIE, STROKES_BAR
+from utils.history import Reading
+from utils.name_analysis import analyze_name
+from utils.records import Series
+from utils.result_store import cached_result
+
+
+def _show(name: str) -> None:
+    """分析并显示（已规范化的）姓名"""
+    name_analysis = cached_result(
+        "name", name_key(name), lambda: analyze_name(name, seed=name_seed(name))
+    )
+
+    st.success("分析完成！")
+
+    # 展示五行分析
+    st.subheader("姓名五行分析")
+
+    # 创建五行分布图
+    element_data = name_analysis['element_analysis']
+    elements = Series.from_mapping(
+        {element: data["percentage"] for element, data in element_data.items()}
+    )
+    st.plotly_chart(ELEMENTS_PIE.fill({
+        "labels": elements.labels,
+        "values": elements.values,
+        "marker": {"colors": [ELEMENT_COLORS[element] for element in elements.labels]},
+    }))
+
+    # 显示笔画分析
+    st.subheader("笔画分析")
+    strokes = Series.from_mapping(name_analysis['strokes'])
+    st.plotly_chart(STROKES_BAR.fill({
+        "x": strokes.labels, "y": strokes.values, "text": [str(value) for value in strokes.values]
+    }))
+
+    # 显示总评
+    st.subheader("姓名总评")
+    st.write(f"总分: {name_analysis['overall_score']}分")
+    st.write(name_analysis['description'])
+
+
+@page("姓名学分析")
+def render():
+    """姓名学分析页面"""
+    st.header("姓名学分析")
+
+    name = st.text_input("输入姓名（简体中文）")
+
+    if st.button("分析姓名", key="name_analysis"):
+        # 去掉空白、繁体转简体后再分析，不同写法的同一姓名结果一致
+        name = normalize_name(name)
+        if len(name) < 2:
+            st.error("请输入完整姓名")
+        else:
+            with st.spinner("正在分析姓名..."):
+                _show(name)
+            record("姓名学分析", text=name, seed=name_seed(name))
+
+
+def title(reading: Reading) -> str:
+    return reading.text
+
+
+def replay(reading: Reading) -> None:
+    """重新显示姓名分析（结果由姓名决定）"""
+    _show(reading.text)
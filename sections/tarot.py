@@ -0,0 +1,66 @@
+import streamlit as st
+
+from sections.common import page
+from sections.history import record
+from utils.history import Reading, new_seed
+from utils.tarot import TarotReader
+
+
+def _show(num_cards: int, seed: int) -> None:
+    """按种子抽牌并显示解读"""
+    # 抽牌；解读在下方逐张流式显示
+    cards = TarotReader.draw_cards(num_cards, seed=seed)
+    summary = TarotReader.get_reading_summary(cards)
+
+    # 显示结果
+    st.subheader("🔮 塔罗牌阵解读")
+
+    # 使用列显示每张牌
+    cols = st.columns(num_cards)
+    for i, (card, col) in enumerate(zip(cards, cols)):
+        with col:
+            st.markdown(f"""
+            <div style='padding: 15px; border-radius: 10px; background-color: rgba(255,245,238,0.9); text-align: center;'>
+                <h4 style='color: #CD0000;'>{card['position']}</h4>
+                <h3>{card['name']}</h3>
+                <p>{'逆位' if card['reversed'] else '正位'}</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+    # 显示详细解读
+    st.markdown("### 详细解读")
+    st.write_stream(TarotReader.iter_interpretation(cards))
+
+    # 显示总体建议
+    st.markdown("### 总体启示")
+    st.info(summary['overall_tendency'])
+    st.success(summary['suggestion'])
+
+
+@page("塔罗牌占卜")
+def render():
+    """塔罗牌占卜页面"""
+    st.header("🎴 塔罗牌占卜")
+
+    # 选择牌阵
+    spread_type = st.radio(
+        "选择牌阵",
+        ["三张牌阵（过去-现在-未来）", "五张牌阵（完整解读）"]
+    )
+
+    num_cards = 5 if "五张" in spread_type else 3
+
+    if st.button("开始占卜", key="tarot_reading"):
+        # 记录种子即可重现同一次抽牌
+        seed = new_seed()
+        _show(num_cards, seed)
+        record("塔罗牌占卜", num_cards, seed=seed)
+
+
+def title(reading: Reading) -> str:
+    return f"{reading.value}张牌阵"
+
+
+def replay(reading: Reading) -> None:
+    """用记录的种子重现当次抽牌"""
+    _show(reading.value, reading.seed)
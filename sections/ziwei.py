@@ -0,0 +1,95 @@
+from datetime import datetime
+
+import streamlit as st
+
+from sections.common import page
+from utils.assets import read_asset
+from utils.canonical import ziwei_key
+from utils.ziwei_calculator import ZiWeiCalculator
+from utils.result_store import get_store
+
+
+@page("紫薇斗数")
+def render():
+    """紫薇斗数页面"""
+    st.header("🏮 紫薇斗数命盘分析")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        birth_date = st.date_input(
+            "选择出生日期",
+            min_value=datetime(1900, 1, 1),
+            max_value=datetime.now(),
+            value=datetime.now()
+        )
+        birth_time = st.time_input("选择出生时间", datetime.now().time())
+
+    with col2:
+        gender = st.radio("性别", ["男", "女"])
+
+    if st.button("生成命盘", key="ziwei_analysis"):
+        # 命盘只取决于月份和时辰，按此缓存；出生信息每次单独附加
+        # 命中缓存时直接读取；否则先生成命盘框架，宫位预测在下方逐宫计算并显示
+        birth_datetime = datetime.combine(birth_date, birth_time)
+        calculator = ZiWeiCalculator(birth_datetime, gender)
+        inputs = ziwei_key(birth_datetime)
+        store = get_store()
+        chart_data = store.get("ziwei", inputs)
+        cached = chart_data is not None
+        if cached:
+            predictions = chart_data["predictions"].items()
+        else:
+            chart_data = calculator.generate_chart_data(with_predictions=False)
+            del chart_data["birth_info"]
+            predictions = calculator.iter_fortune_prediction()
+
+        # 显示命盘
+        st.subheader("📜 命盘显示")
+        try:
+            ziwei_svg = read_asset('assets/ziwei_chart.svg')
+            st.markdown(f'<div style="text-align: center;">{ziwei_svg}</div>', unsafe_allow_html=True)
+        except FileNotFoundError:
+            st.error("Error: ziwei_chart.svg not found in assets folder.")
+
+        # 显示运势分析
+        st.subheader("🔮 命盘解读")
+
+        # 使用expander显示主星分布
+        with st.expander("查看主星分布详情", expanded=True):
+            cols = st.columns(4)
+            main_stars = chart_data["main_stars"]
+            for i, (star, position) in enumerate(main_stars.items()):
+                with cols[i % 4]:
+                    st.markdown(f"""
+                    <div style='padding: 10px; border-radius: 5px; border: 1px solid #CD0000; margin: 5px; text-align: center;'>
+                        <div style='color: #CD0000; font-weight: bold;'>{star}</div>
+                        <div>{position}宫</div>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+        # 显示宫位预测
+        st.subheader("🎴 宫位详解")
+
+        # 先占好三列网格的位置，每算出一个宫位就填入对应格子
+        slots = [col.empty() for _ in range(0, len(ZiWeiCalculator.PALACES), 3) for col in st.columns(3)]
+        for slot, (palace, prediction) in zip(slots, predictions):
+            if not cached:
+                chart_data["predictions"][palace] = prediction
+            slot.markdown(f"""
+            <div style='padding: 15px; border-radius: 10px; background-color: rgba(255,245,238,0.9); margin: 5px;'>
+                <h4 style='color: #CD0000; margin: 0;'>{palace}</h4>
+                <p style='margin: 5px 0;'>{prediction}</p>
+            </div>
+            """, unsafe_allow_html=True)
+        if not cached:
+            store.put("ziwei", inputs, chart_data)
+
+        # 显示出生信息
+        birth_info = calculator.birth_info()
+        st.markdown("---")
+        st.markdown(f"""
+        <div style='text-align: center; padding: 10px;'>
+            <p>农历 {birth_info['year']}年 {birth_info['month']}月 {birth_info['day']}日 {birth_info['hour']}时</p>
+            <p style='color: #666;'>本命盘仅供参考，不作为人生决策依据</p>
+        </div>
+        """, unsafe_allow_html=True)
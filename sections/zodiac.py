@@ -0,0 +1,30 @@
+import streamlit as st
+
+from sections.common import page
+from utils.zodiac_utils import get_zodiac_sign, get_zodiac_compatibility
+
+
+@page("生肖运势")
+def render():
+    """生肖运势页面"""
+    st.header("生肖运势分析")
+
+    birth_year = st.number_input("出生年份", min_value=1900, max_value=2100, value=2000)
+
+    if st.button("查看运势", key="zodiac_analysis"):
+        with st.spinner("正在分析生肖运势..."):
+            zodiac_sign = get_zodiac_sign(birth_year)
+            compatibility = get_zodiac_compatibility(zodiac_sign)
+
+            # Display results
+            st.success("分析完成！")
+
+            col1, col2 = st.columns(2)
+            with col1:
+                st.subheader(f"你的生肖: {zodiac_sign}")
+                st.image(f"https://images.unsplash.com/photo-1517327832109-76f52a6c5eab", width=200)
+
+            with col2:
+                st.subheader("相配生肖")
+                for animal, score in compatibility.items():
+                    st.write(f"{animal}: {'⭐' * score}")
@@ -0,0 +1,36 @@
+from collections import deque
+
+from utils.memory import approx_sizeof
+
+
+def test_deque_items_are_counted():
+    items = ["x" * 100_000, "y" * 100_000]
+    assert approx_sizeof(deque(items)) >= 200_000
+    assert abs(approx_sizeof(deque(items)) - approx_sizeof(list(items))) < 1_000
+
+
+def test_custom_iterable_counts_items_and_attributes():
+    class Bag:
+        def __init__(self):
+            self.items = deque(["z" * 50_000], maxlen=4)
+            self.label = "w" * 50_000
+
+        def __iter__(self):
+            return iter(self.items)
+
+    assert approx_sizeof(Bag()) >= 100_000
+
+
+def test_iterators_are_not_consumed():
+    iterator = iter(["a" * 10_000])
+    approx_sizeof(iterator)
+    assert next(iterator) == "a" * 10_000
+
+
+def test_named_tuple_fields_are_counted():
+    from typing import NamedTuple
+
+    class Entry(NamedTuple):
+        text: str
+
+    assert approx_sizeof(Entry("v" * 20_000)) >= 20_000
@@ -0,0 +1,23 @@
+from utils.metrics import REGISTRY, timed
+
+
+@timed("test.metrics.reset")
+def _work():
+    return sum(range(100))
+
+
+def _summary(name):
+    return next((s for s in REGISTRY.summaries() if s["name"] == name), None)
+
+
+def test_timed_calls_are_recorded_after_reset():
+    _work()
+    assert _summary("test.metrics.reset")["count"] == 1
+
+    REGISTRY.reset()
+    assert _summary("test.metrics.reset") is None
+
+    _work()
+    _work()
+    assert _summary("test.metrics.reset")["count"] == 2
+    assert 'suanming_call_latency_seconds_count{name="test.metrics.reset"} 2' in REGISTRY.to_prometheus()
@@ -0,0 +1,143 @@
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.shared_tables import LUNAR_END, LUNAR_START, get_table
+
+# 常用说法 -> 黄历用语
+ACTIVITY_ALIASES = {
+    "搬家": "移徙",
+    "乔迁": "入宅",
+    "结婚": "嫁娶",
+    "开业": "开市",
+    "开张": "开市",
+    "签约": "立券",
+    "装修": "修造",
+    "旅行": "出行",
+}
+
+
+def _ganzhi_indexes(start: date, end: date) -> Tuple[np.ndarray, np.ndarray]:
+    """逐日的月干支、日干支六十甲子序号
+
+    月干支以节为界（节气当天即属新月），与 ``Lunar.getMonthInGanZhi()`` 一致；
+    两者都按六十甲子连续递增，只需用起始日校准偏移。
+    """
+    from lunar_python import Lunar, Solar
+    from lunar_python.util import LunarUtil
+
+    jie = set()
+    for year in range(start.year - 1, end.year + 2):
+        table = Lunar.fromYmd(year, 6, 1).getJieQiTable()
+        # JIE_QI_IN_USE 中偶数位为“节”，奇数位为“气”
+        for name in Lunar.JIE_QI_IN_USE[::2]:
+            solar = table[name]
+            jie.add(date(solar.getYear(), solar.getMonth(), solar.getDay()).toordinal())
+    jie_ordinals = np.array(sorted(jie), dtype=np.int64)
+
+    ordinals = np.arange(start.toordinal(), end.toordinal() + 1, dtype=np.int64)
+    crossed = np.searchsorted(jie_ordinals, ordinals, side="right")
+
+    first = Solar.fromYmd(start.year, start.month, start.day).getLunar()
+    month_offset = (LunarUtil.getJiaZiIndex(first.getMonthInGanZhi()) - crossed[0]) % 60
+    day_offset = (LunarUtil.getJiaZiIndex(first.getDayInGanZhi()) - ordinals[0]) % 60
+    return (crossed + month_offset) % 60, (ordinals + day_offset) % 60
+
+
+def build_almanac() -> Dict[str, np.ndarray]:
+    """黄历宜忌查表：逐日所属组合、各组合的宜忌词序、逐日“宜”位图及词表本身
+
+    黄历宜忌只由（月干支, 日干支）决定，先对出现过的组合查 lunar_python，
+    再按组合展开到每一天。almanac_yi_order / almanac_ji_order 按
+    ``getDayYi()`` / ``getDayJi()`` 的原顺序保存词表序号（-1 为填充）；
+    “宜”位图每天一行，按词表打包成字节，供按活动检索。
+    """
+    from lunar_python.util import LunarUtil
+
+    months, days = _ganzhi_indexes(LUNAR_START, LUNAR_END)
+    pairs, inverse = np.unique(months * 60 + days, return_inverse=True)
+    yi_ji = [
+        (LunarUtil.getDayYi(LunarUtil.JIA_ZI[pair // 60], LunarUtil.JIA_ZI[pair % 60]),
+         LunarUtil.getDayJi(LunarUtil.JIA_ZI[pair // 60], LunarUtil.JIA_ZI[pair % 60]))
+        for pair in pairs.tolist()
+    ]
+
+    vocab = sorted({activity for yi, ji in yi_ji for activity in (*yi, *ji)})
+    index = {activity: i for i, activity in enumerate(vocab)}
+
+    # 只有“宜”需要按活动检索，位图只建这一张
+    bits = np.zeros((len(pairs), len(vocab)), dtype=np.uint8)
+    for row, (yi, _) in enumerate(yi_ji):
+        bits[row, [index[activity] for activity in yi]] = 1
+    tables = {"almanac_day": inverse.astype(np.int16), "almanac_yi": np.packbits(bits, axis=1)[inverse]}
+    for kind, column in (("yi", 0), ("ji", 1)):
+        order = np.full((len(pairs), max(len(entry[column]) for entry in yi_ji)), -1, dtype=np.int16)
+        for row, entry in enumerate(yi_ji):
+            order[row, :len(entry[column])] = [index[activity] for activity in entry[column]]
+        tables[f"almanac_{kind}_order"] = order
+    tables["almanac_vocab"] = np.frombuffer("\n".join(vocab).encode("utf-8"), dtype=np.uint8)
+    return tables
+
+
+@lru_cache(maxsize=2)
+def _decode_vocab(raw: bytes) -> Tuple[str, ...]:
+    return tuple(raw.decode("utf-8").split("\n"))
+
+
+def _tables() -> Optional[Tuple[np.ndarray, ...]]:
+    # 请求路径上不等待表构建
+    names = ("almanac_day", "almanac_yi", "almanac_yi_order", "almanac_ji_order", "almanac_vocab")
+    tables = [get_table(name, block=False) for name in names]
+    if any(table is None for table in tables):
+        return None
+    *arrays, vocab = tables
+    return (*arrays, _decode_vocab(vocab.tobytes()))
+
+
+def _live_yi_ji(day: date) -> Tuple[List[str], List[str]]:
+    from lunar_python import Solar
+
+    lunar = Solar.fromYmd(day.year, day.month, day.day).getLunar()
+    return lunar.getDayYi(), lunar.getDayJi()
+
+
+def day_yi_ji(day: date) -> Tuple[List[str], List[str]]:
+    """某天的宜、忌活动列表；超出查表范围或表不可用时实时计算"""
+    tables = _tables() if LUNAR_START <= day <= LUNAR_END else None
+    if tables is None:
+        return _live_yi_ji(day)
+    day_pairs, _, yi_order, ji_order, vocab = tables
+    pair = day_pairs[day.toordinal() - LUNAR_START.toordinal()]
+    return tuple([vocab[i] for i in order[pair] if i >= 0] for order in (yi_order, ji_order))
+
+
+def day_tips(day: date) -> List[str]:
+    """黄历宜忌提示，供每日运势面板显示"""
+    yi, ji = day_yi_ji(day)
+    return ["宜：" + "、".join(yi), "忌：" + "、".join(ji)]
+
+
+def next_auspicious(activity: str, start: date = None, within: int = 90) -> Optional[date]:
+    """从 start（默认今天）起 within 天内第一个宜做某事的日子，没有则返回 None"""
+    activity = ACTIVITY_ALIASES.get(activity, activity)
+    start = start or date.today()
+    end = min(start + timedelta(days=within - 1), LUNAR_END)
+    tables = _tables() if LUNAR_START <= start <= end else None
+    if tables is None:
+        for offset in range(within):
+            day = start + timedelta(days=offset)
+            if activity in _live_yi_ji(day)[0]:
+                return day
+        return None
+
+    _, yi, _, _, vocab = tables
+    if activity not in vocab:
+        return None
+    column = vocab.index(activity)
+    first = start.toordinal() - LUNAR_START.toordinal()
+    last = end.toordinal() - LUNAR_START.toordinal()
+    # packbits 为高位在前
+    hits = np.flatnonzero((yi[first:last + 1, column // 8] >> (7 - column % 8)) & 1)
+    return start + timedelta(days=int(hits[0])) if len(hits) else None
@@ -0,0 +1,11 @@
+from functools import lru_cache
+
+# 页面每次重跑都会读取的静态资源
+PAGE_ASSETS = ("styles/custom.css", "assets/celestial_compass.svg", "assets/ziwei_chart.svg")
+
+
+@lru_cache(maxsize=None)
+def read_asset(path: str) -> str:
+    """读取静态资源文本并在进程内缓存；文件不存在时抛出 FileNotFoundError（不缓存）"""
+    with open(path, encoding="utf-8") as f:
+        return f.read()
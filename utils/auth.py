@@ -0,0 +1,6 @@
+import hmac
+
+
+def keys_match(provided: str, expected: str) -> bool:
+    """常数时间比较查询参数中的密钥（按 UTF-8 字节比较，非 ASCII 输入不会抛错）"""
+    return hmac.compare_digest(provided.encode("utf-8"), expected.encode("utf-8"))
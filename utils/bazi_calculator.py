@@ -1,12 +1,76 @@
 from datetime import datetime, date, time
-import pandas as pd
+from functools import lru_cache
+from itertools import count
+from typing import Iterator, List, NamedTuple, Tuple
 
+import numpy as np
+from lunar_python import Lunar
+
+from utils.canonical import birth_minute
+from utils.executor import DEFAULT_TIMEOUT, get_pool
+from utils.metrics import timed
+
+HEAVENLY_STEMS = ["甲", "乙", "丙", "丁", "戊", "己", "庚", "辛", "壬", "癸"]
+EARTHLY_BRANCHES = ["子", "丑", "寅", "卯", "辰", "巳", "午", "未", "申", "酉", "戌", "亥"]
+
+# 六十甲子，序号 i 对应天干 i % 10、地支 i % 12
+JIAZI = [HEAVENLY_STEMS[i % 10] + EARTHLY_BRANCHES[i % 12] for i in range(60)]
+
+# Smallest cohort slice worth shipping to a worker process (about 5 ms per person).
+COHORT_MIN_CHUNK = 200
+
+ELEMENTS = ["木", "火", "土", "金", "水"]
+
+# 五行配色（页面图表与离线报告共用）
+ELEMENT_COLORS = {
+    "木": "#4CAF50",
+    "火": "#FF5722",
+    "土": "#795548",
+    "金": "#9E9E9E",
+    "水": "#2196F3"
+}
+
+# 天干五行（按 ELEMENTS 序号）
+STEM_ELEMENTS = [0, 0, 1, 1, 2, 2, 3, 3, 4, 4]
+
+# 地支藏干（天干序号，-1 表示空位）及权重：本气、中气、余气
+HIDDEN_STEMS = [
+    [9, -1, -1],  # 子：癸
+    [5, 9, 7],    # 丑：己 癸 辛
+    [0, 2, 4],    # 寅：甲 丙 戊
+    [1, -1, -1],  # 卯：乙
+    [4, 1, 9],    # 辰：戊 乙 癸
+    [2, 6, 4],    # 巳：丙 庚 戊
+    [3, 5, -1],   # 午：丁 己
+    [5, 3, 1],    # 未：己 丁 乙
+    [6, 8, 4],    # 申：庚 壬 戊
+    [7, -1, -1],  # 酉：辛
+    [4, 7, 3],    # 戌：戊 辛 丁
+    [8, 0, -1],   # 亥：壬 甲
+]
+HIDDEN_STEM_WEIGHTS = [
+    [1.0, 0.0, 0.0] if row[1] < 0 else [0.7, 0.3, 0.0] if row[2] < 0 else [0.6, 0.3, 0.1]
+    for row in HIDDEN_STEMS
+]
+
+STEM_WEIGHT = 1.0
+BRANCH_WEIGHT = 1.0
+
+# 日主得助比例阈值
+STRONG_RATIO = 0.5
+WEAK_RATIO = 0.35
+
+_STEM_ELEMENT_TABLE = np.array(STEM_ELEMENTS, dtype=np.int64)
+_HIDDEN_STEM_TABLE = np.array(HIDDEN_STEMS, dtype=np.int64)
+_HIDDEN_WEIGHT_TABLE = np.array(HIDDEN_STEM_WEIGHTS)
+
+@timed
 def calculate_bazi(birth_date: date, birth_time: time, gender: str) -> dict:
     """Calculate BaZi (Eight Characters) based on birth date and time."""
     
     # Simplified implementation for demo
-    heavenly_stems = ["甲", "乙", "丙", "丁", "戊", "己", "庚", "辛", "壬", "癸"]
-    earthly_branches = ["子", "丑", "寅", "卯", "辰", "巳", "午", "未", "申", "酉", "戌", "亥"]
+    heavenly_stems = HEAVENLY_STEMS
+    earthly_branches = EARTHLY_BRANCHES
     
     year = birth_date.year
     month = birth_date.month
@@ -25,9 +89,10 @@ def calculate_bazi(birth_date: date, birth_time: time, gender: str) -> dict:
     day_stem = heavenly_stems[day % 10]
     day_branch = earthly_branches[day % 12]
     
-    # Calculate hour pillar (simplified)
-    hour_stem = heavenly_stems[hour % 10]
-    hour_branch = earthly_branches[hour // 2 % 12]
+    # Calculate hour pillar (五鼠遁：时干由日干推出)
+    hour_branch_index = hour // 2 % 12
+    hour_stem = heavenly_stems[(day % 10 % 5 * 2 + hour_branch_index) % 10]
+    hour_branch = earthly_branches[hour_branch_index]
     
     return {
         "year": f"{year_stem}{year_branch}",
@@ -36,30 +101,208 @@ def calculate_bazi(birth_date: date, birth_time: time, gender: str) -> dict:
         "hour": f"{hour_stem}{hour_branch}"
     }
 
+@timed
 def get_five_elements(bazi_result: dict) -> dict:
-    """Calculate Five Elements distribution from BaZi."""
-    
-    # Simplified implementation
-    elements = {
-        "木": 0,
-        "火": 0,
-        "土": 0,
-        "金": 0,
-        "水": 0
-    }
-    
-    # Element associations (simplified)
-    element_map = {
-        "甲": "木", "乙": "木",
-        "丙": "火", "丁": "火",
-        "戊": "土", "己": "土",
-        "庚": "金", "辛": "金",
-        "壬": "水", "癸": "水"
-    }
-    
-    # Count elements
+    """Calculate Five Elements distribution from BaZi.
+
+    Each stem counts ``STEM_WEIGHT``; each branch contributes
+    ``BRANCH_WEIGHT`` split over its hidden stems (藏干) by
+    ``HIDDEN_STEM_WEIGHTS``.
+    """
+    totals = [0.0] * 5
     for pillar in bazi_result.values():
-        if pillar[0] in element_map:
-            elements[element_map[pillar[0]]] += 1
-    
-    return elements
+        stem = HEAVENLY_STEMS.index(pillar[0])
+        branch = EARTHLY_BRANCHES.index(pillar[1])
+        totals[STEM_ELEMENTS[stem]] += STEM_WEIGHT
+        for hidden, weight in zip(HIDDEN_STEMS[branch], HIDDEN_STEM_WEIGHTS[branch]):
+            if hidden >= 0:
+                totals[STEM_ELEMENTS[hidden]] += BRANCH_WEIGHT * weight
+
+    return {element: round(total, 2) for element, total in zip(ELEMENTS, totals)}
+
+
+@timed
+def get_day_master_strength(bazi_result: dict) -> dict:
+    """Judge day-master (日主) strength from the share of supporting elements.
+
+    Support is the day master's own element (比劫) plus the element that
+    generates it (印); the rest drains it.
+    """
+    day_stem = bazi_result["day"][0]
+    element = STEM_ELEMENTS[HEAVENLY_STEMS.index(day_stem)]
+    resource = (element - 1) % 5
+    distribution = list(get_five_elements(bazi_result).values())
+
+    support = distribution[element] + distribution[resource]
+    total = sum(distribution)
+    ratio = support / total if total else 0.0
+
+    if ratio >= STRONG_RATIO:
+        strength = "身强"
+    elif ratio <= WEAK_RATIO:
+        strength = "身弱"
+    else:
+        strength = "中和"
+
+    return {
+        "day_master": day_stem,
+        "element": ELEMENTS[element],
+        "support": round(support, 2),
+        "drain": round(total - support, 2),
+        "ratio": round(ratio, 3),
+        "strength": strength
+    }
+
+
+def pillar_codes(bazi_result: dict) -> List[int]:
+    """Sexagenary codes of the year, month, day and hour pillars."""
+    return [pillar_index(bazi_result[key]) for key in ("year", "month", "day", "hour")]
+
+
+@timed
+def five_elements_matrix(codes: np.ndarray) -> np.ndarray:
+    """Five-element distributions for many charts at once.
+
+    ``codes`` is an N×4 integer array of sexagenary pillar codes; the
+    result is an N×5 float matrix in ``ELEMENTS`` order, built purely from
+    table lookups and ``np.add.at``.
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    n = codes.shape[0]
+    out = np.zeros((n, 5))
+
+    stems = codes % 10
+    rows = np.broadcast_to(np.arange(n)[:, None], stems.shape)
+    np.add.at(out, (rows, _STEM_ELEMENT_TABLE[stems]), STEM_WEIGHT)
+
+    branches = codes % 12
+    hidden = _HIDDEN_STEM_TABLE[branches]
+    weights = _HIDDEN_WEIGHT_TABLE[branches] * BRANCH_WEIGHT
+    rows = np.broadcast_to(np.arange(n)[:, None, None], hidden.shape)
+    # 空位（-1）的权重为 0，索引随意取一个有效值即可
+    np.add.at(out, (rows, _STEM_ELEMENT_TABLE[np.maximum(hidden, 0)]), weights)
+    return out
+
+
+def pillar_index(pillar: str) -> int:
+    """Return the sexagenary (六十甲子) index 0-59 of a stem-branch pillar."""
+    stem = HEAVENLY_STEMS.index(pillar[0])
+    branch = EARTHLY_BRANCHES.index(pillar[1])
+    if (stem - branch) % 2:
+        raise ValueError(f"无效的干支组合: {pillar}")
+    return (6 * stem - 5 * branch) % 60
+
+
+class LuckPillar(NamedTuple):
+    """一步大运（十年）"""
+    step: int
+    pillar: str
+    code: int
+    start_age: float
+    start_year: int
+    end_year: int
+
+
+class AnnualPillar(NamedTuple):
+    """一个流年"""
+    year: int
+    age: int
+    pillar: str
+    code: int
+
+
+def is_forward(year_stem_index: int, gender: str) -> bool:
+    """阳年男、阴年女顺行，其余逆行"""
+    return (year_stem_index % 2 == 0) == (gender == "男")
+
+
+@lru_cache(maxsize=4096)
+def luck_start_months(birth_datetime: datetime, forward: bool) -> int:
+    """起运月数：出生到最近的节（顺行取下一个节、逆行取上一个节），三天折一年"""
+    lunar = Lunar.fromDate(birth_datetime)
+    jie = lunar.getNextJie() if forward else lunar.getPrevJie()
+    solar = jie.getSolar()
+    jie_datetime = datetime(solar.getYear(), solar.getMonth(), solar.getDay(),
+                            solar.getHour(), solar.getMinute(), solar.getSecond())
+    days = abs((jie_datetime - birth_datetime).total_seconds()) / 86400
+    # 三天为一年，即一天折四个月
+    return round(days * 4)
+
+
+def luck_pillars(birth_date: date, birth_time: time, gender: str, max_age: int = 120) -> Iterator[LuckPillar]:
+    """Lazily yield decade luck pillars (大运) up to ``max_age``.
+
+    Only the start age needs a solar-term lookup (cached); every further
+    pillar is a step through the sexagenary cycle from the month pillar.
+    """
+    bazi = calculate_bazi(birth_date, birth_time, gender)
+    forward = is_forward(HEAVENLY_STEMS.index(bazi["year"][0]), gender)
+    start_months = luck_start_months(birth_minute(datetime.combine(birth_date, birth_time)), forward)
+    month_code = pillar_index(bazi["month"])
+    step = 1 if forward else -1
+
+    for n in count():
+        months = start_months + n * 120
+        if months >= max_age * 12:
+            return
+        code = (month_code + step * (n + 1)) % 60
+        start_year = birth_date.year + months // 12
+        yield LuckPillar(n, JIAZI[code], code, round(months / 12, 1), start_year, start_year + 9)
+
+
+def annual_pillars(birth_year: int, start_year: int, years: int = 10) -> Iterator[AnnualPillar]:
+    """Lazily yield annual pillars (流年) from ``start_year``, e.g. within one luck pillar."""
+    for year in range(start_year, start_year + years):
+        code = (year - 4) % 60
+        yield AnnualPillar(year, year - birth_year, JIAZI[code], code)
+
+
+@timed
+def batch_luck_pillars(year_codes: np.ndarray, month_codes: np.ndarray, is_male: np.ndarray,
+                       birth_years: np.ndarray, start_months: np.ndarray,
+                       decades: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+    """Luck pillars for a whole cohort at once.
+
+    Returns an N×decades matrix of sexagenary codes and the matching
+    N×decades matrix of start years.
+    """
+    forward = (np.asarray(year_codes) % 2 == 0) == np.asarray(is_male, dtype=bool)
+    step = np.where(forward, 1, -1)
+    offsets = np.arange(1, decades + 1)
+    codes = (np.asarray(month_codes)[:, None] + step[:, None] * offsets) % 60
+    start_years = (np.asarray(birth_years) + np.asarray(start_months) // 12)[:, None] + (offsets - 1) * 10
+    return codes.astype(np.int8), start_years.astype(np.int16)
+
+
+def cohort_luck_pillars(birth_datetimes: List[datetime], genders: List[str], decades: int = 10,
+                        timeout: float = DEFAULT_TIMEOUT) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute luck pillars for a list of people via :func:`batch_luck_pillars`.
+
+    The per-person pillar and luck-start calculations dominate, so cohorts
+    larger than ``COHORT_MIN_CHUNK`` are split across the shared process pool.
+    """
+    pool = get_pool()
+    slices = pool.split(len(birth_datetimes), COHORT_MIN_CHUNK)
+    if len(slices) == 1:
+        return _cohort_chunk((birth_datetimes, genders, decades))
+    parts = pool.map_chunks(
+        _cohort_chunk, [(birth_datetimes[s], genders[s], decades) for s in slices], timeout=timeout
+    )
+    return np.concatenate([codes for codes, _ in parts]), np.concatenate([years for _, years in parts])
+
+
+def _cohort_chunk(chunk: Tuple[List[datetime], List[str], int]) -> Tuple[np.ndarray, np.ndarray]:
+    """One pool job of :func:`cohort_luck_pillars` (module level so it can be pickled)."""
+    birth_datetimes, genders, decades = chunk
+    n = len(birth_datetimes)
+    year_codes = np.empty(n, dtype=np.int16)
+    month_codes = np.empty(n, dtype=np.int16)
+    start_months = np.empty(n, dtype=np.int32)
+    for i, (birth, gender) in enumerate(zip(birth_datetimes, genders)):
+        bazi = calculate_bazi(birth.date(), birth.time(), gender)
+        year_codes[i] = pillar_index(bazi["year"])
+        month_codes[i] = pillar_index(bazi["month"])
+        start_months[i] = luck_start_months(birth_minute(birth), is_forward(year_codes[i] % 10, gender))
+    is_male = np.array([g == "男" for g in genders])
+    birth_years = np.array([b.year for b in birth_datetimes])
+    return batch_luck_pillars(year_codes, month_codes, is_male, birth_years, start_months, decades)
@@ -0,0 +1,82 @@
+import unicodedata
+import zlib
+from datetime import date, datetime, time
+from typing import Dict, Mapping, Tuple
+
+# 姓名常用繁体字 -> 简体字（笔画、五行表均按简体收录），每项为“繁简”两个字
+_TRADITIONAL_PAIRS = """
+張张 陳陈 劉刘 楊杨 黃黄 趙赵 吳吴 孫孙 馬马 鄭郑 謝谢 許许 韓韩 馮冯 鄧邓
+羅罗 錢钱 葉叶 蕭萧 盧卢 蔣蒋 龍龙 華华 國国 偉伟 東东 麗丽 強强 軍军 紅红
+傑杰 濤涛 輝辉 鳳凤 雲云 飛飞 寶宝 鵬鹏 龐庞 閻阎 顧顾 蘇苏 鍾钟 譚谭 賴赖
+萬万 範范 陸陆 魯鲁 學学 義义 興兴 進进 書书 長长 寧宁 慶庆 樂乐 愛爱 靜静
+嬌娇 嵐岚 銘铭 鋒锋 鈞钧 鐵铁 陽阳 衛卫 達达 溫温 賢贤 聰聪 穎颖 瑩莹 豔艳
+蓮莲 鳴鸣 廣广 順顺 貴贵 開开 連连 賈贾 錦锦 綺绮 潔洁 淵渊 鴻鸿 燁烨 煒炜
+暉晖 曉晓 嘯啸 樺桦 楓枫 權权 歡欢 顏颜 韋韦 鄒邹 關关 莊庄 嚴严 湯汤 聶聂
+閆闫 滿满 齊齐 紀纪 婁娄 鄔邬 凱凯 愷恺 劍剑 億亿 誠诚 謙谦 維维 綠绿 藍蓝
+鶴鹤 嫻娴 韻韵 儀仪 傳传 勝胜 勳勋 壯壮 夢梦 巖岩 帥帅 彥彦 憶忆 懷怀 揚扬
+晉晋 曄晔 棟栋 榮荣 樹树 櫻樱 漢汉 澤泽 濱滨 瀟潇 燦灿 爾尔 環环 瓊琼 碩硕
+禮礼 禎祯 紹绍 綸纶 緯纬 繼继 聖圣 藝艺 蘭兰 詩诗 語语 諾诺 豐丰 貞贞 賓宾
+軒轩 遠远 釗钊 銀银 鍇锴 鎮镇 雙双 靈灵 韜韬 頌颂 頤颐 風风 飄飘 騰腾 驍骁
+鮑鲍 鴿鸽 麥麦 黨党 齡龄 寬宽 應应 戀恋 讓让
+"""
+TRADITIONAL_TO_SIMPLIFIED: Dict[str, str] = {
+    pair[0]: pair[1] for pair in _TRADITIONAL_PAIRS.split()
+}
+_SIMPLIFY = str.maketrans(TRADITIONAL_TO_SIMPLIFIED)
+
+
+def shichen_index(hour: int) -> int:
+    """时辰序号（子 0 … 亥 11）：计算器按每两小时一个时辰取时支"""
+    return hour // 2 % 12
+
+
+def year_cycle(year: int) -> int:
+    """年份在六十甲子中的序号"""
+    return (year - 4) % 60
+
+
+def zodiac_index(year: int) -> int:
+    """生肖序号（鼠 0 … 猪 11）"""
+    return (year - 4) % 12
+
+
+def bazi_key(birth_date: date, birth_time: time) -> Dict[str, int]:
+    """calculate_bazi 只用到年（六十甲子周期）、月、日和时辰，性别不影响四柱"""
+    return {
+        "year": year_cycle(birth_date.year),
+        "month": birth_date.month,
+        "day": birth_date.day,
+        "shichen": shichen_index(birth_time.hour),
+    }
+
+
+def pillars_key(bazi_result: Mapping[str, str]) -> Tuple[int, ...]:
+    """以四柱干支序号作为派生结果（五行等）的键"""
+    from utils.bazi_calculator import pillar_codes
+
+    return tuple(pillar_codes(bazi_result))
+
+
+def ziwei_key(birth_datetime: datetime) -> Dict[str, int]:
+    """紫微命盘只取决于月份和时辰（出生信息由调用方另行附加）"""
+    return {"month": birth_datetime.month, "shichen": shichen_index(birth_datetime.hour)}
+
+
+def birth_minute(birth_datetime: datetime) -> datetime:
+    """起运等按节气精确计算的场景精确到分钟"""
+    return birth_datetime.replace(second=0, microsecond=0)
+
+
+def normalize_name(name: str) -> str:
+    """姓名规范化：NFKC（全角转半角等）、去掉所有空白、繁体转简体"""
+    name = unicodedata.normalize("NFKC", name)
+    return "".join(name.split()).translate(_SIMPLIFY)
+
+
+def name_key(name: str) -> Dict[str, str]:
+    return {"name": normalize_name(name)}
+
+
+def name_seed(name: str) -> int:
+    """以规范化后的姓名作为种子，同一姓名（不论怎样输入）的分析结果固定"""
+    return zlib.crc32(normalize_name(name).encode("utf-8"))
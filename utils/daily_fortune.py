@@ -1,11 +1,34 @@
 import random
-from datetime import datetime
+from datetime import date as date_type, datetime
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from utils.almanac import day_tips
+from utils.executor import DEFAULT_TIMEOUT, get_pool
+from utils.metrics import timed
+
+_MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+# 批量日历每个进程池任务的最少人数（单人约 70 微秒，块太小时进程间传输得不偿失）
+CALENDAR_MIN_CHUNK = 5000
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    """SplitMix64 整数哈希（对 uint64 数组逐元素计算，溢出按模 2^64 回绕）"""
+    x = (x + np.uint64(0x9E3779B97F4A7C15)) & _MASK64
+    x = ((x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)) & _MASK64
+    x = ((x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)) & _MASK64
+    return x ^ (x >> np.uint64(31))
 
 class DailyFortune:
     """每日运势和智慧语录管理类"""
 
     FORTUNE_LEVELS = ["大吉", "吉", "平", "凶", "大凶"]
 
+    # 个性化日历的列顺序
+    DIMENSIONS = ["overall", "love", "career", "wealth"]
+
     WISDOM_QUOTES = [
         "宁静致远，淡泊明志",
         "天行健，君子以自强不息",
@@ -58,55 +81,67 @@ class DailyFortune:
         "相思树底说相思，春风春雨落双枝"
     ]
 
-    DAILY_TIPS = [
-        "宜：结婚、搬家、开业、出行",
-        "忌：动土、安葬、开张、远行",
-        "宜：祈福、求财、开市、交易",
-        "忌：诉讼、动工、理发、置业",
-        "宜：入学、考试、谈判、签约",
-        "忌：置业、乔迁、远行、开业",
-        "宜：交友、谈判、签约、出行",
-        "忌：动土、装修、搬家、开业",
-        "宜：开张、求财、谈判、旅行",
-        "忌：婚嫁、动土、开业、搬迁",
-        "宜：考试、面试、谈判、签约",
-        "忌：装修、开业、搬家、远行"
-    ]
+    @staticmethod
+    def get_fortune_weights(date: datetime) -> Dict[str, float]:
+        """根据日期数字生成总运势的等级权重"""
+        day_num = date.day
+        month_num = date.month
+        return {
+            "大吉": 0.2 + (day_num % 5) * 0.05,
+            "吉": 0.3 + (month_num % 3) * 0.05,
+            "平": 0.3,
+            "凶": 0.15 - (day_num % 3) * 0.02,
+            "大凶": 0.05 - (month_num % 2) * 0.01
+        }
 
     @staticmethod
-    def get_daily_fortune(date: datetime = None) -> dict:
-        """获取每日运势"""
+    @timed
+    def get_daily_fortune(date: datetime = None, pillar_codes: Sequence[int] = None) -> dict:
+        """获取每日运势
+
+        传入八字干支序号 ``pillar_codes`` 时，各项运势等级由（八字, 日期）
+        确定性地生成，与 :meth:`precompute_calendar` 的结果一致。
+        """
         if date is None:
             date = datetime.now()
 
         # 不使用日期作为种子，让每次刷新都随机
         random.seed()
 
-        # 根据日期生成不同的运势组合
-        day_num = int(date.strftime("%d"))
-        month_num = int(date.strftime("%m"))
+        # 当天的日期权重和语录池由全进程共享的每日快照提供
+        day = date.date() if isinstance(date, datetime) else date
+        if day == date_type.today():
+            from utils.daily_snapshot import get_snapshot
+            snapshot = get_snapshot(day)
+            fortune_weights = snapshot.fortune_weights
+            wisdom_quotes, love_quotes = snapshot.wisdom_quotes, snapshot.love_quotes
+        else:
+            fortune_weights = DailyFortune.get_fortune_weights(date)
+            wisdom_quotes, love_quotes = DailyFortune.WISDOM_QUOTES, DailyFortune.LOVE_QUOTES
 
-        # 使用日期数字影响运势的生成
-        fortune_weights = {
-            "大吉": 0.2 + (day_num % 5) * 0.05,
-            "吉": 0.3 + (month_num % 3) * 0.05,
-            "平": 0.3,
-            "凶": 0.15 - (day_num % 3) * 0.02,
-            "大凶": 0.05 - (month_num % 2) * 0.01
-        }
+        if pillar_codes is not None:
+            levels = DailyFortune.personal_levels(pillar_codes, date)
+        else:
+            # 使用日期数字影响运势的生成
+            levels = [
+                DailyFortune.FORTUNE_LEVELS.index(random.choices(
+                    DailyFortune.FORTUNE_LEVELS,
+                    weights=[fortune_weights[level] for level in DailyFortune.FORTUNE_LEVELS])[0]),
+                random.randrange(5), random.randrange(5), random.randrange(5)
+            ]
 
         return {
-            "overall": random.choices(DailyFortune.FORTUNE_LEVELS, 
-                                   weights=[fortune_weights[level] for level in DailyFortune.FORTUNE_LEVELS])[0],
-            "love": random.choice(DailyFortune.FORTUNE_LEVELS),
-            "career": random.choice(DailyFortune.FORTUNE_LEVELS),
-            "wealth": random.choice(DailyFortune.FORTUNE_LEVELS),
-            "wisdom": random.choice(DailyFortune.WISDOM_QUOTES),
-            "love_quote": random.choice(DailyFortune.LOVE_QUOTES),
-            "tips": random.sample(DailyFortune.DAILY_TIPS, 2)
+            "overall": DailyFortune.FORTUNE_LEVELS[levels[0]],
+            "love": DailyFortune.FORTUNE_LEVELS[levels[1]],
+            "career": DailyFortune.FORTUNE_LEVELS[levels[2]],
+            "wealth": DailyFortune.FORTUNE_LEVELS[levels[3]],
+            "wisdom": random.choice(wisdom_quotes),
+            "love_quote": random.choice(love_quotes),
+            "tips": day_tips(day)
         }
 
     @staticmethod
+    @timed
     def get_lucky_colors() -> list:
         """获取幸运颜色"""
         colors = ["红色", "黄色", "蓝色", "绿色", "紫色", "金色", "银色", "白色", 
@@ -114,13 +149,101 @@ class DailyFortune:
         return random.sample(colors, 2)
 
     @staticmethod
+    @timed
     def get_lucky_numbers() -> list:
         """获取幸运数字"""
         return random.sample(range(1, 10), 2)
 
     @staticmethod
+    @timed
     def get_lucky_directions() -> list:
         """获取吉利方位"""
         directions = ["东", "南", "西", "北", "东南", "西南", "东北", "西北",
                      "正东", "正南", "正西", "正北", "艮", "坤", "震", "巽"]
-        return random.sample(directions, 2)
\ No newline at end of file
+        return random.sample(directions, 2)
+
+    @staticmethod
+    def personal_seed(pillar_codes: Sequence[int]) -> int:
+        """把四柱干支序号（各 0-59）压成一个整数种子"""
+        seed = 0
+        for code in pillar_codes:
+            seed = seed * 60 + int(code)
+        return seed
+
+    @staticmethod
+    def _personal_levels(seeds: np.ndarray, start: date_type, days: int) -> np.ndarray:
+        """为若干种子生成从 ``start`` 起连续 ``days`` 天的运势等级，形状 (N, days, 4)"""
+        if isinstance(start, datetime):
+            start = start.date()
+        ordinals = np.arange(start.toordinal(), start.toordinal() + days, dtype=np.uint64)
+        dims = np.arange(4, dtype=np.uint64)
+        keys = ((seeds.astype(np.uint64)[:, None, None] << np.uint64(32))
+                + ordinals[None, :, None] * np.uint64(4) + dims[None, None, :])
+        uniform = (_splitmix64(keys) >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+        # 感情、事业、财运均匀分布
+        levels = np.minimum((uniform * 5).astype(np.uint8), 4)
+
+        # 总运势按当天的日期权重抽取
+        dates = np.arange(np.datetime64(start), np.datetime64(start) + days)
+        months = dates.astype("datetime64[M]")
+        day_nums = (dates - months).astype(np.int64) + 1
+        month_nums = months.astype(np.int64) % 12 + 1
+        cumulative = _WEIGHT_TABLE[day_nums % 15, month_nums % 6]
+        levels[:, :, 0] = (uniform[:, :, 0, None] * cumulative[None, :, -1:] >= cumulative[None, :, :]).sum(axis=2)
+        return levels
+
+    @staticmethod
+    def personal_levels(pillar_codes: Sequence[int], date: date_type) -> List[int]:
+        """某人某天的四项运势等级（FORTUNE_LEVELS 序号）"""
+        seeds = np.array([DailyFortune.personal_seed(pillar_codes)])
+        return DailyFortune._personal_levels(seeds, date, 1)[0, 0].tolist()
+
+    @staticmethod
+    @timed
+    def precompute_calendar(pillar_codes: Sequence[int], year: int) -> np.ndarray:
+        """预计算某人全年的运势日历：(天数, 4) 的 uint8 数组，不足 1.5 KB
+
+        第 i 行为当年第 i+1 天，列顺序见 ``DIMENSIONS``。
+        """
+        return DailyFortune.precompute_calendars([pillar_codes], year)[0]
+
+    @staticmethod
+    @timed
+    def precompute_calendars(pillar_codes: Sequence[Sequence[int]], year: int,
+                             timeout: float = DEFAULT_TIMEOUT) -> np.ndarray:
+        """批量预计算多人全年的运势日历，形状 (N, 天数, 4)，供推送任务使用
+
+        人数超过 ``CALENDAR_MIN_CHUNK`` 时分块交给共享进程池并行计算。
+        """
+        pool = get_pool()
+        slices = pool.split(len(pillar_codes), CALENDAR_MIN_CHUNK)
+        if len(slices) == 1:
+            return _calendar_chunk((pillar_codes, year))
+        return np.concatenate(pool.map_chunks(
+            _calendar_chunk, [(pillar_codes[s], year) for s in slices], timeout=timeout
+        ))
+
+
+def _calendar_chunk(chunk) -> np.ndarray:
+    """precompute_calendars 的一个进程池任务（模块级函数，便于序列化）"""
+    pillar_codes, year = chunk
+    seeds = np.array([DailyFortune.personal_seed(codes) for codes in pillar_codes], dtype=np.uint64)
+    start = date_type(year, 1, 1)
+    days = date_type(year + 1, 1, 1).toordinal() - start.toordinal()
+    return DailyFortune._personal_levels(seeds, start, days)
+
+
+def _build_weight_table() -> np.ndarray:
+    """日期权重只取决于 日 % 15 与 月 % 6，预先算好累计权重表"""
+    table = np.zeros((15, 6, 5))
+    for day_mod in range(15):
+        for month_mod in range(6):
+            # 用满足同余条件的日期代入 get_fortune_weights，保证与逐日计算一致
+            probe = date_type(2000, month_mod or 6, day_mod or 15)
+            weights = DailyFortune.get_fortune_weights(probe)
+            table[day_mod, month_mod] = np.cumsum([weights[level] for level in DailyFortune.FORTUNE_LEVELS])
+    return table
+
+
+_WEIGHT_TABLE = _build_weight_table()
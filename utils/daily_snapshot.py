@@ -0,0 +1,164 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from types import MappingProxyType
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+from utils.daily_fortune import DailyFortune
+from utils.lunar_festival import LunarFestival
+from utils.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+# 每日语录池大小
+QUOTE_POOL_SIZE = 3
+
+
+@dataclass(frozen=True)
+class DailySnapshot:
+    """当天对所有会话都相同的内容（只读）"""
+    day: date
+    festival: Optional[Mapping]
+    fortune_weights: Mapping[str, float]
+    wisdom_quotes: Tuple[str, ...]
+    love_quotes: Tuple[str, ...]
+    build_ms: float
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+@timed
+def build_snapshot(day: date) -> DailySnapshot:
+    """构建某天的共享快照"""
+    start = time.perf_counter()
+    rng = random.Random(day.toordinal())
+    festival = LunarFestival.get_current_festival(datetime.combine(day, datetime.min.time()))
+    return DailySnapshot(
+        day=day,
+        festival=_freeze(festival),
+        fortune_weights=_freeze(DailyFortune.get_fortune_weights(day)),
+        wisdom_quotes=tuple(rng.sample(DailyFortune.WISDOM_QUOTES, QUOTE_POOL_SIZE)),
+        love_quotes=tuple(rng.sample(DailyFortune.LOVE_QUOTES, QUOTE_POOL_SIZE)),
+        build_ms=(time.perf_counter() - start) * 1000,
+    )
+
+
+class DailySnapshotService:
+    """进程级每日快照服务
+
+    每个自然日只构建一次：同一时刻只有一个构建者，其余会话等待并复用
+    同一个结果（single-flight）。等待超时时退回前一天的快照。
+    """
+
+    def __init__(self, builder: Callable[[date], DailySnapshot] = build_snapshot, wait_timeout: float = 10.0):
+        self._builder = builder
+        self._wait_timeout = wait_timeout
+        self._snapshot: Optional[DailySnapshot] = None
+        self._inflight: Dict[date, Future] = {}
+        self._lock = threading.Lock()
+        self._refresher: Optional[threading.Thread] = None
+        self.builds = 0
+
+    @property
+    def current(self) -> Optional[DailySnapshot]:
+        """最近一次构建的快照（可能尚未构建）"""
+        return self._snapshot
+
+    def get(self, day: date = None) -> DailySnapshot:
+        """获取某天（默认今天）的快照"""
+        day = day or date.today()
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.day == day:
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.day == day:
+                return snapshot
+            future = self._inflight.get(day)
+            is_builder = future is None
+            if is_builder:
+                future = Future()
+                self._inflight[day] = future
+
+        if is_builder:
+            return self._build(day, future)
+
+        try:
+            return future.result(timeout=self._wait_timeout)
+        except FutureTimeout:
+            if snapshot is not None:
+                logger.warning("daily snapshot for %s still building, serving %s", day, snapshot.day)
+                return snapshot
+            # 冷启动时没有可退回的快照，继续等待构建者完成（构建失败时其异常会在此抛出）
+            logger.warning("daily snapshot for %s still building, no previous snapshot to serve; waiting", day)
+            return future.result()
+
+    def _build(self, day: date, future: Future) -> DailySnapshot:
+        try:
+            snapshot = self._builder(day)
+        except Exception as exc:
+            with self._lock:
+                self._inflight.pop(day, None)
+            future.set_exception(exc)
+            raise
+
+        # 发布快照与移除在途记录在同一临界区内完成，之后到达的调用方必然能看到新快照
+        with self._lock:
+            # 只让更新的日期覆盖当前快照
+            if self._snapshot is None or self._snapshot.day <= day:
+                self._snapshot = snapshot
+            self._inflight.pop(day, None)
+            self.builds += 1
+        future.set_result(snapshot)
+        logger.info("daily snapshot for %s built in %.1f ms", day, snapshot.build_ms)
+        return snapshot
+
+    def start_midnight_refresh(self) -> None:
+        """启动后台线程，在每个本地午夜主动构建新一天的快照"""
+        with self._lock:
+            if self._refresher is not None:
+                return
+            self._refresher = threading.Thread(target=self._refresh_loop, name="daily-snapshot", daemon=True)
+            self._refresher.start()
+
+    def _refresh_loop(self) -> None:
+        while True:
+            now = datetime.now()
+            next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+            time.sleep(max(1.0, (next_midnight - now).total_seconds()))
+            try:
+                self.get()
+            except Exception:
+                logger.exception("daily snapshot refresh failed")
+
+
+_service: Optional[DailySnapshotService] = None
+_service_lock = threading.Lock()
+
+
+def get_service() -> DailySnapshotService:
+    """进程内共享的快照服务"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                service = DailySnapshotService()
+                service.start_midnight_refresh()
+                _service = service
+    return _service
+
+
+def get_snapshot(day: date = None) -> DailySnapshot:
+    """获取当天的共享只读快照"""
+    return get_service().get(day)
@@ -0,0 +1,163 @@
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional, Sequence
+
+# 进程数为 0 时所有任务在调用线程内执行
+MAX_WORKERS = int(os.environ.get("SUANMING_POOL_WORKERS", str(os.cpu_count() or 2)))
+MAX_PENDING = int(os.environ.get("SUANMING_POOL_MAX_PENDING", str(max(1, MAX_WORKERS) * 4)))
+DEFAULT_TIMEOUT = float(os.environ.get("SUANMING_POOL_TIMEOUT", "30"))
+
+# 进度回调的触发间隔（秒）
+PROGRESS_INTERVAL = 0.2
+
+
+class QueueFullError(RuntimeError):
+    """排队任务已达上限"""
+
+
+class JobTimeoutError(TimeoutError):
+    """任务超过时限"""
+
+
+class CalculationPool:
+    """共享的计算进程池
+
+    限制同时排队的任务数，并为每个任务设置超时。超时的任务无法在
+    工作进程中被强行终止，其结果会被丢弃，占用的排队名额在任务实际
+    结束时释放。
+    """
+
+    def __init__(self, max_workers: int = MAX_WORKERS, max_pending: int = MAX_PENDING,
+                 queue_wait: float = 1.0):
+        self.max_workers = max_workers
+        self.queue_wait = queue_wait
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Streamlit 服务进程是多线程的，使用 spawn 避免 fork 带来的锁状态问题
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def shutdown(self, wait: bool = True) -> None:
+        """关闭工作进程；之后再提交任务会重新创建进程池"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """提交任务；排队已满时抛出 QueueFullError"""
+        if not self._slots.acquire(timeout=self.queue_wait):
+            raise QueueFullError("计算任务排队已满")
+        try:
+            if self.max_workers <= 0:
+                future = Future()
+                try:
+                    future.set_result(fn(*args, **kwargs))
+                except Exception as exc:
+                    future.set_exception(exc)
+            else:
+                try:
+                    future = self._get_executor().submit(fn, *args, **kwargs)
+                except BrokenProcessPool:
+                    # 工作进程异常退出后重建进程池
+                    self.shutdown(wait=False)
+                    future = self._get_executor().submit(fn, *args, **kwargs)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, fn: Callable, *args, timeout: float = DEFAULT_TIMEOUT,
+            on_progress: Callable[[float], None] = None, **kwargs) -> Any:
+        """执行单个任务并等待结果，等待期间定期回调已耗时（秒）"""
+        future = self.submit(fn, *args, **kwargs)
+        start = time.monotonic()
+        while True:
+            elapsed = time.monotonic() - start
+            if elapsed >= timeout:
+                future.cancel()
+                raise JobTimeoutError(f"计算超过 {timeout:g} 秒")
+            done, _ = wait([future], timeout=min(PROGRESS_INTERVAL, timeout - elapsed))
+            if done:
+                try:
+                    return future.result()
+                except BrokenProcessPool:
+                    self.shutdown(wait=False)
+                    raise
+            if on_progress is not None:
+                on_progress(time.monotonic() - start)
+
+    def split(self, count: int, min_chunk: int) -> List[slice]:
+        """把 count 项切成若干块：每个工作进程约两块，每块不少于 min_chunk 项"""
+        chunks = max(1, min(-(-count // max(1, min_chunk)), max(1, self.max_workers) * 2))
+        size = -(-count // chunks) if count else 0
+        return [slice(start, start + size) for start in range(0, count, size)] if size else [slice(0, 0)]
+
+    def map_chunks(self, fn: Callable, chunks: Sequence, timeout: float = DEFAULT_TIMEOUT,
+                   on_progress: Callable[[int, int], None] = None) -> List[Any]:
+        """把分块任务分发到进程池，按完成情况回调进度，结果按输入顺序返回"""
+        futures = []
+        try:
+            for chunk in chunks:
+                futures.append(self.submit(fn, chunk))
+        except QueueFullError:
+            for future in futures:
+                future.cancel()
+            raise
+        index = {future: i for i, future in enumerate(futures)}
+        results: List[Any] = [None] * len(futures)
+        pending = set(futures)
+        deadline = time.monotonic() + timeout
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise JobTimeoutError(f"批量计算超过 {timeout:g} 秒")
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[index[future]] = future.result()
+                if on_progress is not None and done:
+                    on_progress(len(futures) - len(pending), len(futures))
+        finally:
+            for future in pending:
+                future.cancel()
+        return results
+
+
+_pool: Optional[CalculationPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> CalculationPool:
+    """进程内共享的计算进程池"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                pool = CalculationPool()
+                atexit.register(pool.shutdown)
+                _pool = pool
+    return _pool
+
+
+def shutdown_pool() -> None:
+    """关闭共享进程池（如已创建）
+
+    multiprocessing 子进程退出时不会执行 atexit，在这类进程中使用过
+    进程池时需要显式调用，否则父进程会一直等待未退出的工作进程。
+    """
+    if _pool is not None:
+        _pool.shutdown()
@@ -0,0 +1,92 @@
+import pickle
+import threading
+from typing import Any, Callable, Dict, Mapping, Optional
+
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.basedatatypes import BaseFigure
+
+
+def _copy(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """图表字典的深拷贝（经 pickle 往返，比 copy.deepcopy 快数倍）"""
+    return pickle.loads(pickle.dumps(spec, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class PreparedFigure(BaseFigure):
+    """已组装好的图表字典，以 Plotly 图表对象的身份交给 st.plotly_chart
+
+    st.plotly_chart 收到图表对象时只调用 ``to_dict()`` 后序列化，收到普通字典
+    反而会重新构建 go.Figure 逐项校验。这里有意不执行 BaseFigure 的初始化，
+    只支持导出：``to_dict()`` 与 go.Figure 一样每次返回独立的深拷贝；需要
+    修改图表时用 ``to_figure()`` 得到完整的 go.Figure。
+    """
+
+    def __init__(self, spec: Dict[str, Any]):
+        object.__setattr__(self, "_spec", spec)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return _copy(self._spec)
+
+    def to_plotly_json(self) -> Dict[str, Any]:
+        return self.to_dict()
+
+    def to_json(self, **kwargs) -> str:
+        return pio.to_json(self._spec, validate=False, **kwargs)
+
+    def to_figure(self) -> go.Figure:
+        return go.Figure(self.to_dict())
+
+    def __repr__(self) -> str:
+        return f"PreparedFigure({len(self._spec['data'])} traces)"
+
+
+def _merge(base: Dict[str, Any], patch: Mapping[str, Any]) -> Dict[str, Any]:
+    """用 patch 覆盖 trace 字段（base 为本次填充独有的副本），嵌套字典（如 marker）合并一层"""
+    for key, value in patch.items():
+        if isinstance(value, Mapping) and isinstance(base.get(key), Mapping):
+            base[key] = {**base[key], **value}
+        else:
+            base[key] = value
+    return base
+
+
+class FigureTemplate:
+    """图表骨架：layout 与各 trace 的静态部分只构建、校验一次
+
+    ``build`` 返回只含静态属性的 go.Figure（trace 数量与顺序固定），首次使用时
+    转成字典缓存；之后每次 ``fill()`` 复制一份骨架后只替换各 trace 的数据字段，
+    不再经过 Plotly 的逐项校验，各次结果之间及与缓存的骨架之间互不共享。
+    """
+
+    def __init__(self, build: Callable[[], go.Figure]):
+        self._build = build
+        self._spec: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def spec(self) -> Dict[str, Any]:
+        """缓存的骨架字典（只读，需要修改时先复制）"""
+        if self._spec is None:
+            with self._lock:
+                if self._spec is None:
+                    self._spec = self._build().to_dict()
+        return self._spec
+
+    def fill(self, *traces: Mapping[str, Any], **layout) -> PreparedFigure:
+        """按顺序为每个 trace 填入数据；layout 关键字覆盖顶层 layout 字段"""
+        spec = self.spec
+        if len(traces) != len(spec["data"]):
+            raise ValueError(f"图表骨架有 {len(spec['data'])} 个 trace，收到 {len(traces)} 组数据")
+        spec = _copy(spec)
+        spec["data"] = [_merge(base, patch) for base, patch in zip(spec["data"], traces)]
+        spec["layout"].update(layout)
+        return PreparedFigure(spec)
+
+
+# 八字、姓名页面的五行饼图
+ELEMENTS_PIE = FigureTemplate(lambda: go.Figure(go.Pie(), layout=dict(title="五行分布")))
+
+# 姓名笔画柱状图
+STROKES_BAR = FigureTemplate(
+    lambda: go.Figure(go.Bar(name="笔画", textposition="auto"), layout=dict(title="姓名笔画分布"))
+)
@@ -0,0 +1,77 @@
+import secrets
+import time
+from typing import Iterator, List, NamedTuple, Optional
+
+import numpy as np
+
+# 每个会话保留的记录条数
+HISTORY_SIZE = 20
+
+
+class Reading(NamedTuple):
+    """一条占卜记录：只保存重算所需的输入和随机种子，不保存渲染结果
+
+    ``kind`` 为分析类型序号；数值输入（日期、时间、张数等）由记录方打包成
+    一个整数 ``value``，文字输入（姓名、节日名）放在 ``text``。标题在显示时
+    由对应页面按输入生成。
+    """
+    kind: int
+    value: int
+    text: Optional[str]
+    seed: int
+    created: float
+
+
+def new_seed() -> int:
+    """为带随机性的占卜生成种子，记录后可原样重现"""
+    return secrets.randbits(32)
+
+
+class ReadingHistory:
+    """每个会话的定长环形记录，超出容量时覆盖最早的记录
+
+    数值字段存放在预分配的 NumPy 数组中，只有文字输入是独立的字符串对象，
+    读取时才组装成 Reading。
+    """
+
+    __slots__ = ("_kinds", "_values", "_seeds", "_created", "_texts", "_next", "_count")
+
+    def __init__(self, size: int = HISTORY_SIZE):
+        self._kinds = np.zeros(size, dtype=np.int8)
+        self._values = np.zeros(size, dtype=np.int64)
+        self._seeds = np.zeros(size, dtype=np.uint32)
+        self._created = np.zeros(size, dtype=np.float64)
+        self._texts: List[Optional[str]] = [None] * size
+        self._next = 0
+        self._count = 0
+
+    def add(self, kind: int, value: int = 0, text: Optional[str] = None, seed: int = 0) -> Reading:
+        i = self._next
+        created = time.time()
+        self._kinds[i], self._values[i], self._seeds[i], self._created[i] = kind, value, seed, created
+        self._texts[i] = text
+        self._next = (i + 1) % len(self._texts)
+        self._count = min(self._count + 1, len(self._texts))
+        return Reading(kind, value, text, seed, created)
+
+    def _get(self, i: int) -> Reading:
+        return Reading(int(self._kinds[i]), int(self._values[i]), self._texts[i],
+                       int(self._seeds[i]), float(self._created[i]))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Reading]:
+        """从最新到最旧"""
+        size = len(self._texts)
+        return (self._get((self._next - 1 - k) % size) for k in range(self._count))
+
+    def clear(self) -> None:
+        self._texts = [None] * len(self._texts)
+        self._next = self._count = 0
+
+    def nbytes(self) -> int:
+        """近似占用字节数"""
+        from utils.memory import approx_sizeof
+
+        return approx_sizeof(self)
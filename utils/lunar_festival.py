@@ -1,6 +1,8 @@
 from datetime import datetime
 from lunar_python import Lunar
 import random
+from utils.metrics import timed
+from utils.shared_tables import lunar_date
 
 class LunarFestival:
     """农历节日运势计算类"""
@@ -28,13 +30,19 @@ class LunarFestival:
     ]
 
     @staticmethod
-    def get_current_festival() -> dict:
+    @timed
+    def get_current_festival(current_date: datetime = None) -> dict:
         """获取当前或最近的农历节日"""
-        current_date = datetime.now()
-        lunar = Lunar.fromDate(current_date)
-        
-        lunar_month = lunar.getMonth()
-        lunar_day = lunar.getDay()
+        if current_date is None:
+            current_date = datetime.now()
+        # 优先查共享农历表，超出范围或表不可用时实时换算
+        lunar = lunar_date(current_date.date() if isinstance(current_date, datetime) else current_date)
+        if lunar is not None:
+            _, lunar_month, lunar_day = lunar
+        else:
+            lunar = Lunar.fromDate(current_date)
+            lunar_month = lunar.getMonth()
+            lunar_day = lunar.getDay()
         
         # 查找最近的节日
         current_festival = None
@@ -59,20 +67,23 @@ class LunarFestival:
         return current_festival
 
     @staticmethod
-    def get_festival_fortune(festival_name: str) -> dict:
-        """获取节日运势"""
-        # 使用当前时间微秒作为随机种子
-        random.seed(datetime.now().microsecond)
+    @timed
+    def get_festival_fortune(festival_name: str, seed: int = None) -> dict:
+        """获取节日运势，相同 ``seed`` 得到相同结果"""
+        # 未指定种子时使用当前时间微秒
+        if seed is None:
+            seed = datetime.now().microsecond
+        rng = random.Random(seed)
         
         return {
-            "overall": random.choice(["上上", "上", "中上", "中", "中下"]),
-            "fortune": random.choice(LunarFestival.FESTIVAL_FORTUNES),
+            "overall": rng.choice(["上上", "上", "中上", "中", "中下"]),
+            "fortune": rng.choice(LunarFestival.FESTIVAL_FORTUNES),
             "suggestions": [
-                "宜：" + "、".join(random.sample([
+                "宜：" + "、".join(rng.sample([
                     "祈福", "拜访", "团聚", "庆贺", "宴请",
                     "出行", "谈事", "交友", "结缘", "办事"
                 ], 3)),
-                "忌：" + "、".join(random.sample([
+                "忌：" + "、".join(rng.sample([
                     "争执", "外出远行", "操劳", "过度劳累",
                     "独处", "忧思", "急躁", "轻率决策"
                 ], 2))
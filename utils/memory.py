@@ -0,0 +1,244 @@
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 全局内存预算（MB），0 表示不限制；统计口径为登记缓存的近似字节数之和（共享表不计入）
+MEMORY_BUDGET_MB = float(os.environ.get("SUANMING_MEMORY_BUDGET_MB", "0"))
+
+# 后台检查预算的间隔（秒）
+CHECK_INTERVAL = 30.0
+
+# lru_cache 无法遍历条目，按每条的估计大小折算
+LRU_ENTRY_BYTES = 256
+
+
+def _is_container(obj: Any) -> bool:
+    """需要逐项计入元素的容器：list、tuple（含 NamedTuple）、set、deque 等
+
+    字符串、字节串本身已包含内容；迭代器不遍历，避免消耗其内容；
+    带属性的自定义类按属性计入（其内容就保存在属性中）。
+    """
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return True
+    return (isinstance(obj, Iterable)
+            and not isinstance(obj, (str, bytes, bytearray, memoryview, range, Iterator))
+            and not hasattr(obj, "__dict__") and not getattr(obj, "__slots__", ()))
+
+
+def approx_sizeof(obj: Any, _seen: Optional[set] = None) -> int:
+    """递归估算对象占用的字节数（NumPy 数组按 nbytes 计）"""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    nbytes = getattr(obj, "nbytes", None)
+    if isinstance(nbytes, int):
+        return sys.getsizeof(obj) if getattr(obj, "base", None) is not None else nbytes
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict) or hasattr(obj, "items") and callable(obj.items):
+        try:
+            size += sum(approx_sizeof(k, _seen) + approx_sizeof(v, _seen) for k, v in obj.items())
+        except Exception:
+            pass
+    elif _is_container(obj):
+        try:
+            size += sum(approx_sizeof(item, _seen) for item in obj)
+        except Exception:
+            pass
+    elif hasattr(obj, "__dict__"):
+        size += approx_sizeof(vars(obj), _seen)
+    elif hasattr(obj, "__slots__"):
+        size += sum(approx_sizeof(getattr(obj, name), _seen) for name in obj.__slots__ if hasattr(obj, name))
+    return size
+
+
+@dataclass
+class TrackedCache:
+    """登记的一个缓存或表
+
+    ``evict(nbytes)`` 尝试释放约 nbytes 字节并返回实际释放量；为 None
+    表示不可淘汰（只计入统计）。``priority`` 越小表示越容易重建，越先淘汰。
+    """
+    name: str
+    sizeof: Callable[[], int]
+    evict: Optional[Callable[[int], int]] = None
+    priority: int = 0
+    shared: bool = False
+
+
+class MemoryMonitor:
+    """缓存与表的内存账本，并按预算从低价值缓存开始淘汰"""
+
+    def __init__(self, budget_bytes: int = int(MEMORY_BUDGET_MB * 1024 * 1024)):
+        self.budget_bytes = budget_bytes
+        self._caches: Dict[str, TrackedCache] = {}
+        self._lock = threading.Lock()
+        self._checker: Optional[threading.Thread] = None
+        self.evictions = 0
+
+    def register(self, name: str, sizeof: Callable[[], int], evict: Callable[[int], int] = None,
+                 priority: int = 0, shared: bool = False) -> None:
+        """登记缓存；shared 表示内存由多个进程共享（如 mmap 的表）"""
+        with self._lock:
+            self._caches[name] = TrackedCache(name, sizeof, evict, priority, shared)
+
+    def register_lru(self, name: str, func: Callable, priority: int = 0,
+                     entry_bytes: int = LRU_ENTRY_BYTES) -> None:
+        """登记 functools.lru_cache 包装的函数，淘汰时整体清空"""
+        def evict(_: int) -> int:
+            freed = func.cache_info().currsize * entry_bytes
+            func.cache_clear()
+            return freed
+
+        self.register(name, lambda: func.cache_info().currsize * entry_bytes, evict, priority)
+
+    def _sizes(self) -> List[tuple]:
+        with self._lock:
+            caches = list(self._caches.values())
+        sizes = []
+        for cache in caches:
+            try:
+                sizes.append((cache, cache.sizeof()))
+            except Exception:
+                logger.exception("sizeof failed for cache %s", cache.name)
+                sizes.append((cache, 0))
+        return sizes
+
+    def report(self) -> List[Dict]:
+        """各缓存的当前大小，按字节数降序"""
+        rows = [
+            {
+                "name": cache.name,
+                "kib": round(nbytes / 1024, 1),
+                "priority": cache.priority,
+                "evictable": cache.evict is not None,
+                "shared": cache.shared,
+            }
+            for cache, nbytes in self._sizes()
+        ]
+        return sorted(rows, key=lambda row: row["kib"], reverse=True)
+
+    def total_bytes(self) -> int:
+        """计入预算的字节数（进程间共享的表不计入）"""
+        return sum(nbytes for cache, nbytes in self._sizes() if not cache.shared)
+
+    def enforce(self, budget_bytes: int = None) -> List[Dict]:
+        """超出预算时按优先级从低到高淘汰，直到回到预算以内；返回淘汰记录"""
+        budget = self.budget_bytes if budget_bytes is None else budget_bytes
+        if budget <= 0:
+            return []
+        excess = self.total_bytes() - budget
+        if excess <= 0:
+            return []
+
+        with self._lock:
+            candidates = sorted((c for c in self._caches.values() if c.evict is not None), key=lambda c: c.priority)
+        evicted = []
+        for cache in candidates:
+            if excess <= 0:
+                break
+            try:
+                freed = cache.evict(excess)
+            except Exception:
+                logger.exception("eviction failed for cache %s", cache.name)
+                continue
+            if freed:
+                excess -= freed
+                evicted.append({"name": cache.name, "freed_kib": round(freed / 1024, 1)})
+        if evicted:
+            self.evictions += len(evicted)
+            logger.warning("memory budget exceeded, evicted %s", evicted)
+        return evicted
+
+    def start_budget_checker(self, interval: float = CHECK_INTERVAL) -> None:
+        """启动后台线程定期执行预算检查（未设置预算时不启动）"""
+        if self.budget_bytes <= 0:
+            return
+        with self._lock:
+            if self._checker is not None:
+                return
+            self._checker = threading.Thread(target=self._check_loop, args=(interval,), name="memory-budget", daemon=True)
+            self._checker.start()
+
+    def _check_loop(self, interval: float) -> None:
+        while True:
+            time.sleep(interval)
+            try:
+                self.enforce()
+            except Exception:
+                logger.exception("memory budget check failed")
+
+
+def process_rss_bytes() -> Optional[int]:
+    """当前进程常驻内存（仅 Linux 可用，其他平台返回 None）"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def start_tracing(frames: int = 5) -> None:
+    """开启 tracemalloc（有额外开销，只在排查时开启）"""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+
+
+def stop_tracing() -> None:
+    tracemalloc.stop()
+
+
+def top_allocators(limit: int = 15) -> List[Dict]:
+    """按源码行汇总当前 tracemalloc 快照中占用最多的分配；未开启时返回空列表"""
+    if not tracemalloc.is_tracing():
+        return []
+    snapshot = tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ])
+    return [
+        {"location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+         "kib": round(stat.size / 1024, 1), "count": stat.count}
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+
+
+def _register_defaults(monitor: MemoryMonitor) -> None:
+    from utils.bazi_calculator import luck_start_months
+    from utils.daily_snapshot import get_service
+    from utils.result_store import get_store
+    from utils.shared_tables import get_tables
+
+    # 内存层结果可从数据库重新读取，最先淘汰
+    store = get_store()
+    monitor.register("result_store.memory", store.memory_bytes, store.shrink_memory, priority=0)
+    monitor.register_lru("bazi.luck_start_months", luck_start_months, priority=5)
+    # 只读表映射自同一文件，物理页由各进程共享
+    monitor.register("shared_tables", get_tables().nbytes, shared=True)
+    monitor.register("daily_snapshot", lambda: approx_sizeof(get_service().current))
+
+
+_monitor: Optional[MemoryMonitor] = None
+_monitor_lock = threading.Lock()
+
+
+def get_monitor() -> MemoryMonitor:
+    """进程内共享的内存账本，首次获取时登记默认缓存并启动预算检查"""
+    global _monitor
+    if _monitor is None:
+        with _monitor_lock:
+            if _monitor is None:
+                monitor = MemoryMonitor()
+                _register_defaults(monitor)
+                monitor.start_budget_checker()
+                _monitor = monitor
+    return _monitor
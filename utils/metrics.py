@@ -0,0 +1,239 @@
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 直方图桶上界（毫秒），覆盖从亚微秒级查表到秒级排盘
+DEFAULT_BUCKETS_MS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# 设置 SUANMING_METRICS=0 可完全关闭埋点，装饰器直接返回原函数
+ENABLED = os.environ.get("SUANMING_METRICS", "1") != "0"
+
+
+class Histogram:
+    """单个埋点的延迟直方图与调用计数"""
+
+    __slots__ = ("name", "bounds_ns", "counts", "sum_ns", "count", "_lock")
+
+    def __init__(self, name: str, buckets_ms=DEFAULT_BUCKETS_MS):
+        self.name = name
+        self.bounds_ns = [int(b * 1_000_000) for b in buckets_ms]
+        self.counts = [0] * (len(self.bounds_ns) + 1)
+        self.sum_ns = 0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, elapsed_ns: int) -> None:
+        """记录一次耗时（纳秒）"""
+        index = bisect_left(self.bounds_ns, elapsed_ns)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum_ns += elapsed_ns
+            self.count += 1
+
+    def reset(self) -> None:
+        """清零计数（对象本身保留，已装饰的函数继续记录到这里）"""
+        with self._lock:
+            self.counts = [0] * len(self.counts)
+            self.sum_ns = 0
+            self.count = 0
+
+    def quantile(self, q: float) -> float:
+        """按桶内线性插值估算分位数（毫秒）"""
+        with self._lock:
+            counts = list(self.counts)
+            total = self.count
+        if not total:
+            return 0.0
+        target = q * total
+        seen = 0
+        lower = 0
+        for index, bucket_count in enumerate(counts):
+            upper = self.bounds_ns[index] if index < len(self.bounds_ns) else self.bounds_ns[-1]
+            if bucket_count and seen + bucket_count >= target:
+                fraction = (target - seen) / bucket_count
+                return (lower + (upper - lower) * fraction) / 1_000_000
+            seen += bucket_count
+            lower = upper
+        return self.bounds_ns[-1] / 1_000_000
+
+    def summary(self) -> Dict:
+        """汇总统计，供管理页面展示"""
+        count = self.count
+        return {
+            "name": self.name,
+            "count": count,
+            "total_ms": round(self.sum_ns / 1_000_000, 3),
+            "mean_ms": round(self.sum_ns / count / 1_000_000, 4) if count else 0.0,
+            "p50_ms": round(self.quantile(0.5), 4),
+            "p95_ms": round(self.quantile(0.95), 4),
+            "p99_ms": round(self.quantile(0.99), 4),
+        }
+
+
+class MetricsRegistry:
+    """进程级埋点注册表"""
+
+    def __init__(self):
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str) -> Histogram:
+        """获取（必要时创建）指定名称的直方图"""
+        hist = self._histograms.get(name)
+        if hist is None:
+            with self._lock:
+                hist = self._histograms.setdefault(name, Histogram(name))
+        return hist
+
+    def summaries(self) -> List[Dict]:
+        """按总耗时降序返回所有有记录的埋点的汇总"""
+        return sorted((h.summary() for h in list(self._histograms.values()) if h.count),
+                      key=lambda s: s["total_ms"], reverse=True)
+
+    def reset(self) -> None:
+        """清空统计；直方图在装饰时已被捕获，只能清零不能移除"""
+        with self._lock:
+            histograms = list(self._histograms.values())
+        for hist in histograms:
+            hist.reset()
+
+    def to_prometheus(self) -> str:
+        """导出 Prometheus 文本格式"""
+        lines = [
+            "# HELP suanming_call_latency_seconds Latency of instrumented calls.",
+            "# TYPE suanming_call_latency_seconds histogram",
+        ]
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+        for name, hist in histograms:
+            with hist._lock:
+                counts = list(hist.counts)
+                sum_ns = hist.sum_ns
+                count = hist.count
+            label = _escape_label(name)
+            cumulative = 0
+            for bound, bucket_count in zip(hist.bounds_ns, counts):
+                cumulative += bucket_count
+                lines.append(
+                    f'suanming_call_latency_seconds_bucket{{name="{label}",le="{bound / 1e9:g}"}} {cumulative}'
+                )
+            lines.append(f'suanming_call_latency_seconds_bucket{{name="{label}",le="+Inf"}} {count}')
+            lines.append(f'suanming_call_latency_seconds_sum{{name="{label}"}} {sum_ns / 1e9:.9f}')
+            lines.append(f'suanming_call_latency_seconds_count{{name="{label}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REGISTRY = MetricsRegistry()
+
+
+class _Timer:
+    """既可作装饰器也可作上下文管理器的计时器"""
+
+    __slots__ = ("_hist", "_start")
+
+    def __init__(self, hist: Optional[Histogram]):
+        self._hist = hist
+        self._start = 0
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._hist is not None:
+            self._hist.observe(time.perf_counter_ns() - self._start)
+        return False
+
+    def __call__(self, func: Callable) -> Callable:
+        hist = self._hist
+        if hist is None:
+            return func
+        observe = hist.observe
+        clock = time.perf_counter_ns
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(clock() - start)
+
+        return wrapper
+
+
+def timed(name=None):
+    """为函数或代码块记录耗时
+
+    用法::
+
+        @timed
+        def calculate_bazi(...): ...
+
+        with timed("page.八字分析"):
+            ...
+    """
+    if callable(name):
+        func = name
+        return timed(f"{func.__module__}.{func.__qualname__}")(func)
+
+    if not ENABLED:
+        return _Timer(None)
+
+    if name is None:
+        # 装饰器未指定名称时，在装饰时按函数全名注册
+        def decorator(func: Callable) -> Callable:
+            return timed(f"{func.__module__}.{func.__qualname__}")(func)
+        return decorator
+
+    return _Timer(REGISTRY.histogram(name))
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.to_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_failed = False
+_server_lock = threading.Lock()
+
+
+def start_http_server(port: int, host: str = "127.0.0.1") -> Optional[ThreadingHTTPServer]:
+    """在后台线程启动 /metrics 端点，重复调用只启动一次
+
+    端口被占用等启动失败只记录一次日志并返回 None，之后不再重试。
+    """
+    global _server, _server_failed
+    with _server_lock:
+        if _server is None and not _server_failed:
+            try:
+                _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            except OSError:
+                _server_failed = True
+                logger.exception("metrics endpoint could not listen on %s:%d, disabled for this process", host, port)
+                return None
+            threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+        return _server
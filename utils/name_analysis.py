@@ -1,8 +1,18 @@
 import random
 from datetime import datetime
+from utils.metrics import timed
 
-def analyze_name(name: str) -> dict:
-    """Analyze Chinese name based on stroke counts and five elements."""
+@timed
+def analyze_name(name: str, seed: int = None) -> dict:
+    """Analyze Chinese name based on stroke counts and five elements.
+
+    The same ``seed`` always yields the same analysis; without one the
+    current time is used.
+    """
+    # 使用当前时间毫秒数来增加随机性
+    if seed is None:
+        seed = datetime.now().microsecond
+    rng = random.Random(seed)
 
     # 扩展笔画字典
     stroke_count = {
@@ -17,30 +27,26 @@ def analyze_name(name: str) -> dict:
     elements_data = {
         "木": {
             "chars": ["李", "杨", "林", "植", "桂", "柳"],
-            "weight": random.uniform(0.8, 1.2)
+            "weight": rng.uniform(0.8, 1.2)
         },
         "火": {
             "chars": ["丁", "朱", "赵", "炎", "焱", "熊"],
-            "weight": random.uniform(0.8, 1.2)
+            "weight": rng.uniform(0.8, 1.2)
         },
         "土": {
             "chars": ["王", "张", "孙", "田", "房", "黄"],
-            "weight": random.uniform(0.8, 1.2)
+            "weight": rng.uniform(0.8, 1.2)
         },
         "金": {
             "chars": ["陈", "徐", "钱", "铭", "钧", "锋"],
-            "weight": random.uniform(0.8, 1.2)
+            "weight": rng.uniform(0.8, 1.2)
         },
         "水": {
             "chars": ["吴", "江", "何", "洪", "沈", "潘"],
-            "weight": random.uniform(0.8, 1.2)
+            "weight": rng.uniform(0.8, 1.2)
         }
     }
 
-    # 使用当前时间毫秒数来增加随机性
-    current_ms = datetime.now().microsecond
-    random.seed(current_ms)
-
     # Calculate strokes for each character
     name_strokes = {}
     total_strokes = 0
@@ -49,8 +55,8 @@ def analyze_name(name: str) -> dict:
 
     for char in name:
         # 随机化笔画数在合理范围内
-        base_strokes = stroke_count.get(char, random.randint(4, 15))
-        variation = random.randint(-1, 1)  # 添加±1的变化
+        base_strokes = stroke_count.get(char, rng.randint(4, 15))
+        variation = rng.randint(-1, 1)  # 添加±1的变化
         final_strokes = max(1, base_strokes + variation)
         name_strokes[char] = final_strokes
         total_strokes += final_strokes
@@ -66,9 +72,9 @@ def analyze_name(name: str) -> dict:
 
         if not found_element:
             # 如果找不到对应的五行，随机选择一个，但权重较低
-            element = random.choice(list(elements_data.keys()))
+            element = rng.choice(list(elements_data.keys()))
             name_elements.append(element)
-            element_weights.append(random.uniform(0.5, 0.9))
+            element_weights.append(rng.uniform(0.5, 0.9))
 
     # 计算五行组合得分
     element_combo_score = len(set(name_elements)) * 5  # 五行种类越多越好
@@ -130,7 +136,7 @@ def analyze_name(name: str) -> dict:
     # 选择适合分数的描述
     for score_range, desc_list in descriptions.items():
         if score_range[0] <= final_score <= score_range[1]:
-            description = random.choice(desc_list)
+            description = rng.choice(desc_list)
             break
 
     # 生成五行分析
@@ -0,0 +1,156 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utils.auth import keys_match
+
+PROFILE_DIR = Path(os.environ.get("SUANMING_PROFILE_DIR", ".profiles"))
+MAX_FILES = int(os.environ.get("SUANMING_PROFILE_MAX_FILES", "50"))
+MAX_BYTES = int(os.environ.get("SUANMING_PROFILE_MAX_BYTES", str(20 * 1024 * 1024)))
+
+# 采样间隔（秒）
+DEFAULT_INTERVAL = 0.005
+
+# 当前线程正在进行的剖析（嵌套调用时复用，不重复采样）
+_active = threading.local()
+
+
+class SamplingProfiler:
+    """对指定线程定时采样调用栈，生成 collapsed-stack 计数"""
+
+    def __init__(self, thread_id: int, interval: float = DEFAULT_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SamplingProfiler":
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.stacks
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_qualname}@{Path(code.co_filename).name}:{code.co_firstlineno}")
+                frame = frame.f_back
+            stack.reverse()
+            self.stacks[";".join(stack)] += 1
+            self.samples += 1
+
+
+def write_collapsed(stacks: Counter, label: str, directory: Optional[Path] = None) -> Optional[Path]:
+    """写出 flamegraph 兼容的 collapsed-stack 文件并执行轮转"""
+    if not stacks:
+        return None
+    directory = directory or PROFILE_DIR
+    directory.mkdir(parents=True, exist_ok=True)
+    safe_label = "".join(ch if ch.isalnum() else "_" for ch in label)
+    path = directory / f"{datetime.now():%Y%m%d-%H%M%S-%f}-{safe_label}.folded"
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+    rotate(directory)
+    return path
+
+
+def rotate(directory: Optional[Path] = None, max_files: int = MAX_FILES, max_bytes: int = MAX_BYTES) -> None:
+    """按文件数和总大小上限删除最旧的剖析文件"""
+    directory = directory or PROFILE_DIR
+    files = sorted(directory.glob("*.folded"), key=lambda p: p.stat().st_mtime, reverse=True)
+    total = 0
+    for index, path in enumerate(files):
+        total += path.stat().st_size
+        if index >= max_files or total > max_bytes:
+            path.unlink(missing_ok=True)
+
+
+def recent_profiles(directory: Optional[Path] = None, limit: int = 20) -> List[Path]:
+    """按时间倒序列出最近的剖析文件"""
+    directory = directory or PROFILE_DIR
+    if not directory.exists():
+        return []
+    files = sorted(directory.glob("*.folded"), key=lambda p: p.stat().st_mtime, reverse=True)
+    return files[:limit]
+
+
+def top_functions(paths: List[Path], limit: int = 20) -> List[Dict]:
+    """汇总剖析文件，返回自身耗时最高的函数"""
+    self_samples: Counter = Counter()
+    total_samples: Counter = Counter()
+    grand_total = 0
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                stack, _, count = line.rstrip("\n").rpartition(" ")
+                if not stack:
+                    continue
+                count = int(count)
+                frames = stack.split(";")
+                grand_total += count
+                self_samples[frames[-1]] += count
+                for frame in set(frames):
+                    total_samples[frame] += count
+
+    return [
+        {
+            "function": frame,
+            "self_samples": count,
+            "total_samples": total_samples[frame],
+            "self_pct": round(count / grand_total * 100, 1),
+            "total_pct": round(total_samples[frame] / grand_total * 100, 1),
+        }
+        for frame, count in self_samples.most_common(limit)
+    ]
+
+
+def is_profile_request(query_params) -> bool:
+    """?profile=1&profile_key=<key>，key 须在 SUANMING_PROFILE_KEYS 白名单中"""
+    if query_params.get("profile") != "1":
+        return False
+    provided = query_params.get("profile_key") or ""
+    allowed = [k.strip() for k in os.environ.get("SUANMING_PROFILE_KEYS", "").split(",") if k.strip()]
+    return any(keys_match(provided, key) for key in allowed)
+
+
+@contextmanager
+def maybe_profile(query_params, label: str):
+    """对白名单会话的本次重跑进行采样剖析，其余情况不产生任何开销
+
+    整页重跑与页面 fragment 单独重跑都会进入这里；已在剖析中的嵌套调用
+    直接复用外层的剖析器。
+    """
+    current = getattr(_active, "profiler", None)
+    if current is not None or not is_profile_request(query_params):
+        yield current
+        return
+
+    profiler = SamplingProfiler(threading.get_ident()).start()
+    _active.profiler = profiler
+    start = time.perf_counter()
+    try:
+        yield profiler
+    finally:
+        _active.profiler = None
+        stacks = profiler.stop()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        write_collapsed(stacks, f"{label}-{elapsed_ms:.0f}ms")
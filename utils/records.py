@@ -0,0 +1,32 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Mapping, Sequence, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class Series:
+    """一组带标签的数值，可直接作为饼图或柱状图 trace 的数据"""
+    labels: Tuple[str, ...]
+    values: Tuple[float, ...]
+
+    @classmethod
+    def from_mapping(cls, mapping: Mapping[str, float]) -> "Series":
+        return cls(tuple(mapping), tuple(mapping.values()))
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+
+@dataclass(frozen=True, slots=True)
+class TrendSeries:
+    """多日运势趋势：每个维度对应逐日的等级名称"""
+    dates: Tuple[date, ...]
+    levels: Mapping[str, Tuple[str, ...]]
+
+    @classmethod
+    def from_columns(cls, dates: Sequence[date], columns: Mapping[str, Sequence[str]]) -> "TrendSeries":
+        return cls(tuple(dates), {name: tuple(column) for name, column in columns.items()})
+
+    def scores(self, name: str, scale: Dict[str, int]) -> Tuple[int, ...]:
+        """把某个维度的等级换算为数值"""
+        return tuple(scale[level] for level in self.levels[name])
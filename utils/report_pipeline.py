@@ -0,0 +1,291 @@
+"""离线批量报告流水线
+
+读取客户 CSV（列：id, name, birth_date, birth_time, gender），通过 ``utils``
+中的计算器生成八字、五行、生肖、姓名和紫薇斗数各部分，图表直接输出为
+静态 SVG（不依赖浏览器），每位客户组装成一个独立的 HTML 文件，边生成边
+写入 zip。计算分散到多个进程，同时在途的批次数有上限，CSV 也是逐行读取，
+因此内存占用与客户总数无关。
+
+用法::
+
+    python -m utils.report_pipeline customers.csv --output reports.zip --workers 8
+"""
+import argparse
+import csv
+import html
+import io
+import logging
+import math
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date, datetime, time as dtime
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+from utils.bazi_calculator import (
+    ELEMENT_COLORS, calculate_bazi, get_day_master_strength, get_five_elements, luck_pillars
+)
+from utils.canonical import name_seed, normalize_name
+from utils.metrics import timed
+from utils.name_analysis import analyze_name
+from utils.records import Series
+from utils.ziwei_calculator import ZiWeiCalculator
+from utils.zodiac_utils import get_zodiac_compatibility, get_zodiac_sign
+
+COLUMNS = ("id", "name", "birth_date", "birth_time", "gender")
+
+# 每个进程任务包含的客户数，以及每个进程允许同时在途的批次数
+CHUNK_SIZE = 50
+IN_FLIGHT_PER_WORKER = 2
+
+# 饼图默认配色（Plotly 默认色板）
+DEFAULT_COLORS = ["#636EFA", "#EF553B", "#00CC96", "#AB63FA", "#FFA15A",
+                  "#19D3F3", "#FF6692", "#B6E880", "#FF97FF", "#FECB52"]
+
+
+def svg_pie(series: Series, colors: Mapping[str, str] = None, size: int = 220) -> str:
+    """饼图（带图例），零值扇区省略"""
+    total = sum(series.values)
+    radius = size / 2 - 10
+    cx = cy = size / 2
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{size + 110}" height="{size}" '
+             f'viewBox="0 0 {size + 110} {size}">']
+    angle = -math.pi / 2
+    for i, (label, value) in enumerate(zip(series.labels, series.values)):
+        color = (colors or {}).get(label, DEFAULT_COLORS[i % len(DEFAULT_COLORS)])
+        if total > 0 and value > 0:
+            sweep = 2 * math.pi * value / total
+            if sweep >= 2 * math.pi - 1e-9:
+                parts.append(f'<circle cx="{cx}" cy="{cy}" r="{radius}" fill="{color}"/>')
+            else:
+                x1, y1 = cx + radius * math.cos(angle), cy + radius * math.sin(angle)
+                x2, y2 = cx + radius * math.cos(angle + sweep), cy + radius * math.sin(angle + sweep)
+                large = 1 if sweep > math.pi else 0
+                parts.append(f'<path d="M{cx},{cy} L{x1:.2f},{y1:.2f} A{radius},{radius} 0 {large} 1 '
+                             f'{x2:.2f},{y2:.2f} Z" fill="{color}" stroke="#fff" stroke-width="1"/>')
+            angle += sweep
+        share = value / total * 100 if total else 0
+        y = 20 + i * 20
+        parts.append(f'<rect x="{size + 5}" y="{y - 10}" width="12" height="12" fill="{color}"/>')
+        parts.append(f'<text x="{size + 22}" y="{y}" font-size="12">{html.escape(str(label))} {share:.1f}%</text>')
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def svg_bar(series: Series, color: str = DEFAULT_COLORS[0], height: int = 200, bar_width: int = 40) -> str:
+    """柱状图，柱顶标注数值"""
+    top = max(series.values, default=0) or 1
+    width = len(series) * (bar_width + 20) + 20
+    plot_height = height - 40
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+             f'viewBox="0 0 {width} {height}">']
+    for i, (label, value) in enumerate(zip(series.labels, series.values)):
+        x = 20 + i * (bar_width + 20)
+        bar_height = plot_height * value / top
+        y = 15 + plot_height - bar_height
+        parts.append(f'<rect x="{x}" y="{y:.1f}" width="{bar_width}" height="{bar_height:.1f}" fill="{color}"/>')
+        parts.append(f'<text x="{x + bar_width / 2}" y="{y - 3:.1f}" font-size="12" text-anchor="middle">{value:g}</text>')
+        parts.append(f'<text x="{x + bar_width / 2}" y="{height - 8}" font-size="14" '
+                     f'text-anchor="middle">{html.escape(str(label))}</text>')
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def _table(headers: List[str], rows: Iterable[Iterable]) -> str:
+    head = "".join(f"<th>{html.escape(str(h))}</th>" for h in headers)
+    body = "".join(
+        "<tr>" + "".join(f"<td>{html.escape(str(cell))}</td>" for cell in row) + "</tr>" for row in rows
+    )
+    return f"<table><tr>{head}</tr>{body}</table>"
+
+
+@timed
+def build_report(customer: Mapping[str, str]) -> Dict:
+    """计算一位客户报告的全部内容"""
+    birth_date = date.fromisoformat(customer["birth_date"])
+    birth_time = dtime.fromisoformat(customer["birth_time"])
+    gender = customer["gender"]
+    name = customer["name"]
+
+    bazi = calculate_bazi(birth_date, birth_time, gender)
+    zodiac = get_zodiac_sign(birth_date.year)
+    compatibility = get_zodiac_compatibility(zodiac)
+    return {
+        "bazi": bazi,
+        "five_elements": get_five_elements(bazi),
+        "day_master": get_day_master_strength(bazi),
+        "luck_pillars": list(islice(luck_pillars(birth_date, birth_time, gender), 8)),
+        "zodiac": zodiac,
+        "best_matches": sorted(compatibility, key=compatibility.get, reverse=True)[:3],
+        # 与姓名页面相同的种子，报告与页面结果一致
+        "name": analyze_name(normalize_name(name), seed=name_seed(name)),
+        "ziwei": ZiWeiCalculator(datetime.combine(birth_date, birth_time), gender).generate_chart_data(),
+    }
+
+
+_STYLE = """
+body { font-family: "Noto Serif SC", SimSun, serif; max-width: 860px; margin: 24px auto; color: #333; }
+h1, h2 { color: #8B0000; } h2 { border-bottom: 1px solid #CD0000; padding-bottom: 4px; }
+table { border-collapse: collapse; margin: 8px 0; } td, th { border: 1px solid #ddd; padding: 4px 10px; }
+th { background: #FFF5EE; } .charts { display: flex; gap: 24px; flex-wrap: wrap; align-items: flex-end; }
+"""
+
+
+def render_html(customer: Mapping[str, str], report: Mapping) -> str:
+    """把报告内容组装为独立的 HTML 文档（图表为内联 SVG）"""
+    name = html.escape(customer["name"])
+    bazi = report["bazi"]
+    day_master = report["day_master"]
+    name_analysis = report["name"]
+    ziwei = report["ziwei"]
+
+    sections = [
+        f"<h1>{name} 命理报告</h1>",
+        f"<p>出生：{html.escape(customer['birth_date'])} {html.escape(customer['birth_time'])}"
+        f"　性别：{html.escape(customer['gender'])}</p>",
+
+        "<h2>八字</h2>",
+        _table(["年柱", "月柱", "日柱", "时柱"], [[bazi["year"], bazi["month"], bazi["day"], bazi["hour"]]]),
+
+        "<h2>五行</h2>",
+        '<div class="charts">' + svg_pie(Series.from_mapping(report["five_elements"]), ELEMENT_COLORS) + "</div>",
+        f"<p>日主：{day_master['day_master']}（{day_master['element']}） {day_master['strength']}，"
+        f"得助 {day_master['support']} / 耗泄 {day_master['drain']}</p>",
+
+        "<h2>大运</h2>",
+        _table(["大运", "起运年龄", "起止年份"],
+               [[p.pillar, p.start_age, f"{p.start_year}-{p.end_year}"] for p in report["luck_pillars"]]),
+
+        "<h2>生肖</h2>",
+        f"<p>生肖：{report['zodiac']}　最相合：{'、'.join(report['best_matches'])}</p>",
+
+        "<h2>姓名</h2>",
+        '<div class="charts">'
+        + svg_pie(Series.from_mapping({e: d["percentage"] for e, d in name_analysis["element_analysis"].items()}),
+                  ELEMENT_COLORS)
+        + svg_bar(Series.from_mapping(name_analysis["strokes"]))
+        + "</div>",
+        f"<p>总分：{name_analysis['overall_score']:.0f} 分　{html.escape(name_analysis['description'])}</p>",
+
+        "<h2>紫薇斗数</h2>",
+        f"<p>命宫：{ziwei['ming_gong']}</p>",
+        _table(["宫位", "解读"], [[palace, text.replace("\n", " ")] for palace, text in ziwei["predictions"].items()]),
+
+        "<p style='color: #666;'>本报告仅供娱乐参考，不作为人生决策依据</p>",
+    ]
+    return (f"<!DOCTYPE html><html lang='zh'><head><meta charset='utf-8'><title>{name} 命理报告</title>"
+            f"<style>{_STYLE}</style></head><body>{''.join(sections)}</body></html>")
+
+
+def render_chunk(customers: List[Dict[str, str]]) -> List[Tuple[str, Optional[bytes], Optional[str]]]:
+    """在工作进程中渲染一批客户，返回（客户 id, HTML 字节, 错误信息）"""
+    results = []
+    for customer in customers:
+        try:
+            document = render_html(customer, build_report(customer))
+            results.append((customer["id"], document.encode("utf-8"), None))
+        except Exception as exc:  # 单个客户数据有误不影响整批
+            results.append((customer.get("id", "?"), None, f"{type(exc).__name__}: {exc}"))
+    return results
+
+
+def iter_customers(path: str) -> Iterator[Dict[str, str]]:
+    """逐行读取客户 CSV"""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        missing = set(COLUMNS) - set(reader.fieldnames or ())
+        if missing:
+            raise ValueError(f"客户文件缺少列: {', '.join(sorted(missing))}")
+        for row in reader:
+            yield {column: (row[column] or "").strip() for column in COLUMNS}
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _safe_filename(customer_id: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in customer_id) or "unknown"
+
+
+def _unique_name(stem: str, used: Set[str]) -> str:
+    """zip 内文件名去重：重复的 id（或清洗后相同的 id）依次加 -2、-3 … 后缀"""
+    name, n = f"{stem}.html", 1
+    while name in used:
+        n += 1
+        name = f"{stem}-{n}.html"
+    used.add(name)
+    return name
+
+
+def run_pipeline(input_path: str, output_path: str, workers: int = os.cpu_count() or 2,
+                 chunk_size: int = CHUNK_SIZE) -> Dict:
+    """运行整条流水线，返回统计信息
+
+    已完成的批次立即写入 zip；在途批次数不超过 ``workers * IN_FLIGHT_PER_WORKER``。
+    失败的客户汇总写入 zip 中的 errors.csv。
+    """
+    start = time.perf_counter()
+    written = 0
+    errors: List[Tuple[str, str]] = []
+    used_names: Set[str] = set()
+    max_in_flight = max(1, workers) * IN_FLIGHT_PER_WORKER
+
+    with zipfile.ZipFile(output_path, "w", compression=zipfile.ZIP_DEFLATED) as archive, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+
+        def drain(pending, return_when) -> set:
+            nonlocal written
+            done, pending = wait(pending, return_when=return_when)
+            for future in done:
+                for customer_id, document, error in future.result():
+                    if error is not None:
+                        errors.append((customer_id, error))
+                        continue
+                    archive.writestr(_unique_name(_safe_filename(customer_id), used_names), document)
+                    written += 1
+            return pending
+
+        pending = set()
+        for chunk in _chunks(iter_customers(input_path), chunk_size):
+            if len(pending) >= max_in_flight:
+                pending = drain(pending, FIRST_COMPLETED)
+            pending.add(pool.submit(render_chunk, chunk))
+        drain(pending, ALL_COMPLETED)
+
+        if errors:
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows([("id", "error"), *errors])
+            archive.writestr("errors.csv", buffer.getvalue())
+
+    elapsed = time.perf_counter() - start
+    return {
+        "reports": written,
+        "errors": len(errors),
+        "seconds": round(elapsed, 1),
+        "reports_per_second": round(written / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="批量生成客户命理报告（HTML + SVG，打包为 zip）")
+    parser.add_argument("input", help="客户 CSV 文件（id,name,birth_date,birth_time,gender）")
+    parser.add_argument("--output", default="reports.zip", help="输出 zip 路径")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="工作进程数")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="每个进程任务包含的客户数")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    stats = run_pipeline(args.input, args.output, args.workers, args.chunk_size)
+    print(f"已生成 {stats['reports']} 份报告（失败 {stats['errors']}），"
+          f"用时 {stats['seconds']} 秒，{stats['reports_per_second']} 份/秒 -> {args.output}")
+    return 1 if stats["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from utils.memory import approx_sizeof
+
+# 每个节点一个数据库文件
+STORE_PATH = os.environ.get("SUANMING_STORE_PATH", ".cache/results.sqlite3")
+MAX_ENTRIES = int(os.environ.get("SUANMING_STORE_MAX_ENTRIES", "200000"))
+
+# 计算器版本：计算规则变化时递增，旧版本结果的键随之失效
+CALCULATOR_VERSIONS = {
+    "bazi": 2,
+    "five_elements": 2,
+    "ziwei": 2,
+    "name": 1,
+}
+
+
+def make_key(calculator: str, inputs: Any) -> str:
+    """由计算器名称、版本和输入生成规范化的哈希键"""
+    payload = json.dumps(
+        [calculator, CALCULATOR_VERSIONS.get(calculator, 0), inputs],
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultStore:
+    """基于 SQLite（WAL 模式）的持久化计算结果存储
+
+    写入和访问记录先在内存中缓冲，达到批量大小或间隔后一次性落盘；
+    条目数超过上限时按最近访问时间淘汰最旧的结果。
+    """
+
+    def __init__(self, path: str = STORE_PATH, max_entries: int = MAX_ENTRIES,
+                 batch_size: int = 64, flush_interval: float = 2.0, memory_entries: int = 4096):
+        self.path = path
+        self.max_entries = max_entries
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.memory_entries = memory_entries
+
+        self._lock = threading.RLock()
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        # 内存层每个条目在写入时估算的字节数及其总和
+        self._sizes: Dict[str, int] = {}
+        self._memory_bytes = 0
+        self._pending: Dict[str, tuple] = {}
+        self._touched: Dict[str, int] = {}
+        self._last_flush = time.monotonic()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY,"
+            " calculator TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " hits INTEGER NOT NULL DEFAULT 0,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_access ON results(last_access)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_hits ON results(hits)")
+
+    def _remember(self, key: str, value: str) -> None:
+        if self._memory.get(key) is not value:
+            size = approx_sizeof(key) + approx_sizeof(value)
+            self._memory_bytes += size - self._sizes.get(key, 0)
+            self._sizes[key] = size
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._forget_oldest()
+
+    def _forget_oldest(self) -> int:
+        """丢弃内存层最久未访问的条目，返回其字节数"""
+        key, _ = self._memory.popitem(last=False)
+        size = self._sizes.pop(key)
+        self._memory_bytes -= size
+        return size
+
+    def get(self, calculator: str, inputs: Any) -> Optional[Any]:
+        """读取结果，未命中返回 None"""
+        key = make_key(calculator, inputs)
+        with self._lock:
+            value = self._memory.get(key)
+            if value is None and key in self._pending:
+                value = self._pending[key][1]
+            if value is None:
+                row = self._conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                value = row[0]
+            self._remember(key, value)
+            self._touched[key] = self._touched.get(key, 0) + 1
+            self._maybe_flush()
+        return json.loads(value)
+
+    def contains(self, calculator: str, inputs: Any) -> bool:
+        """是否已有结果（不计入访问记录，也不载入内存层），供预热等内部检查使用"""
+        key = make_key(calculator, inputs)
+        with self._lock:
+            if key in self._memory or key in self._pending:
+                return True
+            return self._conn.execute("SELECT 1 FROM results WHERE key = ?", (key,)).fetchone() is not None
+
+    def put(self, calculator: str, inputs: Any, result: Any) -> None:
+        """写入结果（批量落盘）"""
+        key = make_key(calculator, inputs)
+        value = json.dumps(result, ensure_ascii=False, separators=(",", ":"), default=str)
+        with self._lock:
+            self._pending[key] = (calculator, value)
+            self._remember(key, value)
+            self._maybe_flush()
+
+    def get_or_compute(self, calculator: str, inputs: Any, compute: Callable[[], Any]) -> Any:
+        """命中则直接返回，否则计算并写入（计算结果为 None 时不写入）"""
+        cached = self.get(calculator, inputs)
+        if cached is not None:
+            return cached
+        result = compute()
+        if result is not None:
+            self.put(calculator, inputs, result)
+        return result
+
+    def _maybe_flush(self) -> None:
+        if (len(self._pending) + len(self._touched) >= self.batch_size
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """将缓冲的写入和访问记录一次性落盘，并执行淘汰"""
+        with self._lock:
+            if not self._pending and not self._touched:
+                self._last_flush = time.monotonic()
+                return
+            now = time.time()
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO results (key, calculator, value, hits, last_access) VALUES (?, ?, ?, 0, ?)"
+                    " ON CONFLICT(key) DO UPDATE SET value = excluded.value, last_access = excluded.last_access",
+                    [(key, calculator, value, now) for key, (calculator, value) in self._pending.items()]
+                )
+                self._conn.executemany(
+                    "UPDATE results SET hits = hits + ?, last_access = ? WHERE key = ?",
+                    [(hits, now, key) for key, hits in self._touched.items()]
+                )
+                self._evict()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._pending.clear()
+            self._touched.clear()
+            self._last_flush = time.monotonic()
+
+    def _evict(self) -> None:
+        count = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM results WHERE key IN"
+                " (SELECT key FROM results ORDER BY last_access ASC LIMIT ?)",
+                (excess,)
+            )
+
+    def warm_up(self, limit: int = 1000) -> int:
+        """启动时把命中次数最多的结果预加载到内存"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM results ORDER BY hits DESC LIMIT ?",
+                (min(limit, self.memory_entries),)
+            ).fetchall()
+            # 热度低的先放入，保证最热的结果位于 LRU 末端
+            for key, value in reversed(rows):
+                self._remember(key, value)
+        return len(rows)
+
+    def memory_bytes(self) -> int:
+        """内存层缓存的近似字节数"""
+        return self._memory_bytes
+
+    def shrink_memory(self, nbytes: int) -> int:
+        """从最久未访问的一端丢弃内存层条目，直到释放约 nbytes 字节，返回实际释放量
+
+        只影响内存层，结果仍保存在数据库中。
+        """
+        freed = 0
+        with self._lock:
+            while self._memory and freed < nbytes:
+                freed += self._forget_oldest()
+        return freed
+
+    def stats(self) -> Dict:
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            return {
+                "entries": count,
+                "memory_entries": len(self._memory),
+                "pending_writes": len(self._pending),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+
+_store: Optional[ResultStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> ResultStore:
+    """进程内共享的结果存储，首次获取时预热"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                store = ResultStore()
+                store.warm_up()
+                atexit.register(store.flush)
+                _store = store
+    return _store
+
+
+def cached_result(calculator: str, inputs: Any, compute: Callable[[], Any]) -> Any:
+    """通过默认存储读取或计算结果"""
+    return get_store().get_or_compute(calculator, inputs, compute)
@@ -0,0 +1,293 @@
+import fcntl
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 同一节点上的所有应用进程共用一个目录
+TABLES_DIR = Path(os.environ.get("SUANMING_TABLES_DIR", ".cache/tables"))
+ENABLED = os.environ.get("SUANMING_SHARED_TABLES", "1") != "0"
+
+# 表结构版本：构建逻辑变化时递增，旧文件随之失效
+SCHEMA_VERSION = 3
+
+# 文件格式：魔数、结构版本、头部长度，随后是 JSON 头部和按 ALIGN 对齐的数组数据
+MAGIC = b"SMTB"
+_PREFIX = struct.Struct("<4sIQ")
+ALIGN = 64
+
+CURRENT = "CURRENT"
+LOCK = ".lock"
+
+# 农历查表范围（公历）
+LUNAR_START = date(1900, 1, 1)
+LUNAR_END = date(2100, 12, 31)
+
+# 儒略日与 date.toordinal() 的差值
+_JULIAN_OFFSET = 1721425
+
+# 检查是否有新版本的最短间隔（秒）
+REFRESH_INTERVAL = 5.0
+
+
+class TablesUnavailableError(RuntimeError):
+    """表构建或映射失败"""
+
+
+def _build_lunar_calendar() -> Dict[str, np.ndarray]:
+    """按农历月逐段填充公历每一天对应的农历年、月（闰月为负）、日"""
+    from lunar_python import LunarYear
+
+    days = LUNAR_END.toordinal() - LUNAR_START.toordinal() + 1
+    years = np.zeros(days, dtype=np.int16)
+    months = np.zeros(days, dtype=np.int8)
+    day_nums = np.zeros(days, dtype=np.int8)
+    for lunar_year in range(LUNAR_START.year - 1, LUNAR_END.year + 1):
+        for month in LunarYear.fromYear(lunar_year).getMonthsInYear():
+            first = int(month.getFirstJulianDay()) - _JULIAN_OFFSET - LUNAR_START.toordinal()
+            count = month.getDayCount()
+            start, end = max(first, 0), min(first + count, days)
+            if start >= end:
+                continue
+            years[start:end] = month.getYear()
+            months[start:end] = month.getMonth()
+            day_nums[start:end] = np.arange(start - first + 1, end - first + 1)
+    return {"lunar_year": years, "lunar_month": months, "lunar_day": day_nums}
+
+
+def _build_zodiac_compatibility() -> Dict[str, np.ndarray]:
+    """生肖相合分数，12×12，对角线为 0"""
+    from utils.zodiac_utils import COMPATIBILITY, ZODIAC_ANIMALS
+
+    table = np.zeros((12, 12), dtype=np.int8)
+    for i, animal in enumerate(ZODIAC_ANIMALS):
+        for j, other in enumerate(ZODIAC_ANIMALS):
+            table[i, j] = COMPATIBILITY[animal].get(other, 0)
+    return {"zodiac_compatibility": table}
+
+
+def _build_almanac() -> Dict[str, np.ndarray]:
+    """黄历逐日宜忌位图"""
+    from utils.almanac import build_almanac
+
+    return build_almanac()
+
+
+# 每个构建函数返回若干命名数组
+TABLE_BUILDERS: Dict[str, Callable[[], Dict[str, np.ndarray]]] = {
+    "lunar_calendar": _build_lunar_calendar,
+    "zodiac_compatibility": _build_zodiac_compatibility,
+    "almanac": _build_almanac,
+}
+
+
+def build_tables() -> Dict[str, np.ndarray]:
+    """运行所有构建函数"""
+    arrays = {}
+    for builder in TABLE_BUILDERS.values():
+        arrays.update(builder())
+    return arrays
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+def write_tables(path: Path, arrays: Dict[str, np.ndarray]) -> None:
+    """把数组写入单个只读表文件（先写临时文件再原子改名）"""
+    entries = {}
+    offset = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        entries[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset = _align(offset + array.nbytes)
+    header = json.dumps({"schema": SCHEMA_VERSION, "tables": entries}).encode("utf-8")
+    data_start = _align(_PREFIX.size + len(header))
+
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, SCHEMA_VERSION, len(header)))
+        f.write(header)
+        for name, array in arrays.items():
+            f.seek(data_start + entries[name]["offset"])
+            f.write(np.ascontiguousarray(array).tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class SharedTables:
+    """跨进程共享的只读查表数据
+
+    所有表构建一次后写入一个带版本的文件，各进程以只读 mmap 映射，
+    查表得到的是零拷贝的 NumPy 视图，物理内存由页缓存在进程间共享。
+    目录下的 CURRENT 文件指向当前版本，重建时写入新文件后原子替换
+    该指针，已映射旧版本的进程在下次刷新时切换到新版本。
+    """
+
+    def __init__(self, directory: Path = TABLES_DIR, refresh_interval: float = REFRESH_INTERVAL):
+        self.directory = Path(directory)
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self._views: Dict[str, np.ndarray] = {}
+        self._checked = 0.0
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._version
+
+    def _read_pointer(self) -> Optional[str]:
+        try:
+            return (self.directory / CURRENT).read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def build(self, force: bool = False) -> str:
+        """构建并发布新版本（进程间互斥），返回版本文件名
+
+        已有相同结构版本的文件且未强制重建时直接返回现有版本。
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / LOCK, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                current = self._read_pointer()
+                if (not force and current is not None
+                        and current.startswith(f"tables-{SCHEMA_VERSION}-")
+                        and (self.directory / current).exists()):
+                    return current
+
+                start = time.perf_counter()
+                arrays = build_tables()
+                digest = hashlib.sha256()
+                for name in sorted(arrays):
+                    digest.update(name.encode("utf-8"))
+                    digest.update(np.ascontiguousarray(arrays[name]).tobytes())
+                version = f"tables-{SCHEMA_VERSION}-{digest.hexdigest()[:12]}.bin"
+                write_tables(self.directory / version, arrays)
+
+                pointer = self.directory / f"{CURRENT}.{os.getpid()}.tmp"
+                pointer.write_text(version)
+                os.replace(pointer, self.directory / CURRENT)
+                logger.info("shared tables %s built in %.0f ms", version, (time.perf_counter() - start) * 1000)
+
+                # 已映射旧文件的进程不受删除影响
+                for stale in self.directory.glob("tables-*.bin"):
+                    if stale.name != version:
+                        stale.unlink(missing_ok=True)
+                return version
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _attach(self, version: str) -> Dict[str, np.ndarray]:
+        with open(self.directory / version, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, schema, header_len = _PREFIX.unpack_from(buffer, 0)
+        if magic != MAGIC or schema != SCHEMA_VERSION:
+            raise ValueError(f"表文件格式不匹配: {version}")
+        header = json.loads(buffer[_PREFIX.size:_PREFIX.size + header_len])
+        data_start = _align(_PREFIX.size + header_len)
+
+        views = {}
+        for name, entry in header["tables"].items():
+            dtype = np.dtype(entry["dtype"])
+            count = int(np.prod(entry["shape"], dtype=np.int64))
+            views[name] = np.frombuffer(
+                buffer, dtype=dtype, count=count, offset=data_start + entry["offset"]
+            ).reshape(entry["shape"])
+        return views
+
+    def refresh(self) -> None:
+        """发现新版本时重新映射；没有可用版本（或结构版本已过期）时先构建
+
+        构建或映射失败时抛出 TablesUnavailableError。
+        """
+        version = self._read_pointer()
+        try:
+            if (version is None or not version.startswith(f"tables-{SCHEMA_VERSION}-")
+                    or not (self.directory / version).exists()):
+                version = self.build()
+            views = self._attach(version) if version != self._version else None
+        except Exception as exc:
+            raise TablesUnavailableError(f"共享表不可用: {exc}") from exc
+        if views is not None:
+            # 整体替换引用，读者要么看到旧版本要么看到新版本
+            self._views, self._version = views, version
+        self._checked = time.monotonic()
+
+    def get(self, name: str, block: bool = True) -> Optional[np.ndarray]:
+        """按名称获取只读表视图，没有该表时返回 None
+
+        ``block`` 为 False 时，若本进程中另一线程正在构建或映射表（如启动预热），
+        不等待而直接返回 None（已映射过的旧版本仍照常返回）。
+        """
+        if self._version is None or time.monotonic() - self._checked >= self.refresh_interval:
+            if not self._lock.acquire(blocking=block):
+                return self._views.get(name)
+            try:
+                if self._version is None or time.monotonic() - self._checked >= self.refresh_interval:
+                    self.refresh()
+            finally:
+                self._lock.release()
+        return self._views.get(name)
+
+    def nbytes(self) -> int:
+        return sum(view.nbytes for view in self._views.values())
+
+
+_tables: Optional[SharedTables] = None
+_tables_lock = threading.Lock()
+_unavailable = not ENABLED
+
+
+def get_tables() -> SharedTables:
+    """进程内共享的表管理器"""
+    global _tables
+    if _tables is None:
+        with _tables_lock:
+            if _tables is None:
+                _tables = SharedTables()
+    return _tables
+
+
+def get_table(name: str, block: bool = True) -> Optional[np.ndarray]:
+    """获取共享表；表不可用（被禁用、构建失败或非阻塞时正在构建）时返回 None，
+    调用方自行退回实时计算
+
+    只有构建或映射失败才会在本进程内停用共享表，其他错误只影响本次调用。
+    """
+    global _unavailable
+    if _unavailable:
+        return None
+    try:
+        return get_tables().get(name, block=block)
+    except TablesUnavailableError:
+        logger.exception("shared tables unavailable, falling back to direct computation")
+        _unavailable = True
+    except Exception:
+        logger.exception("shared table %s lookup failed, falling back to direct computation", name)
+    return None
+
+
+def lunar_date(day: date) -> Optional[tuple]:
+    """查表得到公历日期对应的（农历年, 月, 日），月份为负表示闰月；超出范围返回 None"""
+    if not LUNAR_START <= day <= LUNAR_END:
+        return None
+    # 请求路径上不等待表构建，构建期间由调用方实时换算
+    years, months, days = (get_table(name, block=False) for name in ("lunar_year", "lunar_month", "lunar_day"))
+    if years is None or months is None or days is None:
+        return None
+    index = day.toordinal() - LUNAR_START.toordinal()
+    return int(years[index]), int(months[index]), int(days[index])
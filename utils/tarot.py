@@ -1,6 +1,7 @@
 import random
 from datetime import datetime
-from typing import List, Dict
+from typing import Dict, Iterator, List
+from utils.metrics import timed
 
 class TarotReader:
     """塔罗牌占卜系统"""
@@ -67,10 +68,13 @@ class TarotReader:
     }
 
     @staticmethod
-    def draw_cards(num_cards: int = 3) -> List[Dict]:
-        """抽取指定数量的塔罗牌"""
-        # 使用当前时间微秒作为随机种子
-        random.seed(datetime.now().microsecond)
+    @timed
+    def draw_cards(num_cards: int = 3, seed: int = None) -> List[Dict]:
+        """抽取指定数量的塔罗牌，相同 ``seed`` 抽出相同的牌"""
+        # 未指定种子时使用当前时间微秒
+        if seed is None:
+            seed = datetime.now().microsecond
+        rng = random.Random(seed)
         
         # 合并所有牌
         all_cards = []
@@ -79,11 +83,11 @@ class TarotReader:
                 "name": card_name,
                 "type": "major",
                 "info": card_info,
-                "reversed": random.choice([True, False])
+                "reversed": rng.choice([True, False])
             })
         
         # 随机抽取指定数量的牌
-        drawn_cards = random.sample(all_cards, min(num_cards, len(all_cards)))
+        drawn_cards = rng.sample(all_cards, min(num_cards, len(all_cards)))
         
         # 添加位置解释
         positions = ["过去", "现在", "未来", "建议", "结果"]
@@ -93,11 +97,9 @@ class TarotReader:
         return drawn_cards
 
     @staticmethod
-    def interpret_reading(cards: List[Dict]) -> str:
-        """解读塔罗牌阵"""
-        interpretation = []
-        
-        for card in cards:
+    def iter_interpretation(cards: List[Dict]) -> Iterator[str]:
+        """逐张生成塔罗牌解读"""
+        for i, card in enumerate(cards):
             card_name = card["name"]
             position = card["position"]
             is_reversed = card["reversed"]
@@ -105,15 +107,20 @@ class TarotReader:
             meaning = card["info"]["reversed" if is_reversed else "upright"]
             orientation = "逆位" if is_reversed else "正位"
             
-            interpretation.append(f"""
+            yield ("\n" if i else "") + f"""
             {position}牌位：{card_name}（{orientation}）
             含义：{meaning}
             解释：{card["info"]["description"]}
-            """)
-        
-        return "\n".join(interpretation)
+            """
+
+    @staticmethod
+    @timed
+    def interpret_reading(cards: List[Dict]) -> str:
+        """解读塔罗牌阵"""
+        return "".join(TarotReader.iter_interpretation(cards))
 
     @staticmethod
+    @timed
     def get_reading_summary(cards: List[Dict]) -> Dict:
         """获取塔罗牌阵整体解读"""
         # 计算整体倾向
@@ -0,0 +1,145 @@
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_tables() -> None:
+    """构建（或映射）共享查表数据"""
+    from utils.shared_tables import get_table
+
+    for name in ("lunar_year", "lunar_month", "lunar_day", "zodiac_compatibility",
+                 "almanac_day", "almanac_yi", "almanac_yi_order", "almanac_ji_order", "almanac_vocab"):
+        get_table(name)
+
+
+def _warm_lunar() -> None:
+    """初始化 lunar_python 的节气表等内部数据"""
+    from lunar_python import Lunar
+
+    Lunar.fromDate(datetime.now()).getPrevJie()
+
+
+def _warm_assets() -> None:
+    from utils.assets import PAGE_ASSETS, read_asset
+
+    for path in PAGE_ASSETS:
+        try:
+            read_asset(path)
+        except FileNotFoundError:
+            logger.warning("asset %s not found", path)
+
+
+def _warm_snapshot() -> None:
+    """当天的共享快照（含今日节日）"""
+    from utils.daily_snapshot import get_snapshot
+
+    get_snapshot()
+
+
+def _warm_ziwei() -> None:
+    """命盘只取决于月份和时辰（与性别无关），把 12 个月 × 12 个时辰共 144 种命盘预先写入结果存储"""
+    from utils.canonical import ziwei_key
+    from utils.result_store import get_store
+    from utils.ziwei_calculator import ZiWeiCalculator
+
+    store = get_store()
+    for month in range(1, 13):
+        for hour in range(0, 24, 2):
+            birth_datetime = datetime(2000, month, 1, hour)
+            inputs = ziwei_key(birth_datetime)
+            # 只检查是否存在，不计入命中统计
+            if not store.contains("ziwei", inputs):
+                chart = ZiWeiCalculator(birth_datetime, "男").generate_chart_data()
+                del chart["birth_info"]
+                store.put("ziwei", inputs, chart)
+
+
+def _warm_plotly() -> None:
+    """加载 Plotly 的校验器和默认模板，并构建共用的图表骨架"""
+    import plotly.graph_objects as go
+    import plotly.io as pio
+
+    from utils.figures import ELEMENTS_PIE, STROKES_BAR
+
+    pio.to_json(go.Figure(go.Scatter(x=[0], y=[0])))
+    for template in (ELEMENTS_PIE, STROKES_BAR):
+        template.spec
+
+
+# 按顺序执行的预热步骤
+WARMUP_STEPS: List[Tuple[str, Callable[[], None]]] = [
+    ("tables", _warm_tables),
+    ("lunar", _warm_lunar),
+    ("assets", _warm_assets),
+    ("snapshot", _warm_snapshot),
+    ("ziwei", _warm_ziwei),
+    ("plotly", _warm_plotly),
+]
+
+
+class Warmup:
+    """后台预热：启动时在独立线程中依次执行预热步骤
+
+    单个步骤失败只记录日志，不影响其他步骤；全部执行完后 ``ready`` 置位。
+    预热期间页面照常工作，只是可能走较慢的实时计算路径。
+    """
+
+    def __init__(self, steps: List[Tuple[str, Callable[[], None]]] = None):
+        self.steps = WARMUP_STEPS if steps is None else steps
+        self.ready = threading.Event()
+        self.durations: Dict[str, float] = {}
+        self.total_ms: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """启动预热线程（只启动一次）"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="warmup", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        start = time.perf_counter()
+        for name, step in self.steps:
+            step_start = time.perf_counter()
+            try:
+                with timed(f"warmup.{name}"):
+                    step()
+            except Exception:
+                logger.exception("warm-up step %s failed", name)
+            self.durations[name] = (time.perf_counter() - step_start) * 1000
+        self.total_ms = (time.perf_counter() - start) * 1000
+        self.ready.set()
+        logger.info(
+            "warm-up finished in %.0f ms (%s)", self.total_ms,
+            ", ".join(f"{name} {ms:.0f} ms" for name, ms in self.durations.items())
+        )
+
+
+_warmup: Optional[Warmup] = None
+_warmup_lock = threading.Lock()
+
+
+def start_warmup() -> Warmup:
+    """进程内只启动一次后台预热"""
+    global _warmup
+    if _warmup is None:
+        with _warmup_lock:
+            if _warmup is None:
+                warmup = Warmup()
+                warmup.start()
+                _warmup = warmup
+    return _warmup
+
+
+def is_ready() -> bool:
+    """预热是否已完成（未启动预热时视为就绪）"""
+    return _warmup is None or _warmup.ready.is_set()
@@ -1,5 +1,7 @@
 import datetime
-from typing import Dict, List, Tuple
+from functools import lru_cache
+from typing import Dict, Iterator, List, Tuple
+from utils.metrics import timed
 
 class ZiWeiCalculator:
     """紫薇斗数计算类"""
@@ -60,6 +62,7 @@ class ZiWeiCalculator:
             "hour": self.birth_datetime.hour
         }
 
+    @timed
     def calculate_ming_gong(self) -> str:
         """计算命宫位置"""
         month = self.lunar_date["month"]
@@ -74,19 +77,25 @@ class ZiWeiCalculator:
         branch_index = hour // 2
         return self.EARTHLY_BRANCHES[branch_index]
 
+    @timed
     def calculate_main_stars(self) -> Dict[str, str]:
         """计算主星位置"""
-        main_star_positions = {}
-        ming_gong = self.calculate_ming_gong()
+        return dict(ZiWeiCalculator._main_star_layout(self.calculate_ming_gong()))
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _main_star_layout(ming_gong: str) -> Tuple[Tuple[str, str], ...]:
+        """主星排布只取决于命宫，按命宫缓存"""
+        main_star_positions = []
 
         # 简化的主星安排逻辑
-        for star in self.MAIN_STARS:
+        for star in ZiWeiCalculator.MAIN_STARS:
             # 这里使用简化的逻辑，实际应该根据紫薇斗数规则计算
-            position = self.EARTHLY_BRANCHES[(self.EARTHLY_BRANCHES.index(ming_gong) + 
-                                           self.MAIN_STARS.index(star)) % 12]
-            main_star_positions[star] = position
+            position = ZiWeiCalculator.EARTHLY_BRANCHES[(ZiWeiCalculator.EARTHLY_BRANCHES.index(ming_gong) + 
+                                                      ZiWeiCalculator.MAIN_STARS.index(star)) % 12]
+            main_star_positions.append((star, position))
 
-        return main_star_positions
+        return tuple(main_star_positions)
 
     def _analyze_palace_stars(self, stars: List[str]) -> str:
         """分析宫位中星曜组合的吉凶"""
@@ -105,13 +114,13 @@ class ZiWeiCalculator:
         else:
             return "凶"
 
+    @timed
     def get_palace_meaning(self, palace: str) -> str:
         """获取宫位的详细解释"""
         return self.PALACE_MEANINGS.get(palace, "暂无解释")
 
-    def get_fortune_prediction(self) -> Dict[str, str]:
-        """获取运势预测"""
-        predictions = {}
+    def iter_fortune_prediction(self) -> Iterator[Tuple[str, str]]:
+        """逐宫生成运势预测，每次产出（宫位, 预测）"""
         main_stars = self.calculate_main_stars()
 
         # 扩展的运势判断逻辑
@@ -127,21 +136,29 @@ class ZiWeiCalculator:
             else:
                 prediction = f"平 - {self.get_palace_meaning(palace)}\n无主星入驻"
 
-            predictions[palace] = prediction
+            yield palace, prediction
 
-        return predictions
+    @timed
+    def get_fortune_prediction(self) -> Dict[str, str]:
+        """获取运势预测"""
+        return dict(self.iter_fortune_prediction())
 
-    def generate_chart_data(self) -> Dict:
-        """生成命盘数据"""
+    def birth_info(self) -> Dict:
+        """命盘附带的出生信息（不参与排盘，按月份和时辰缓存的命盘不含此项）"""
+        return {
+            "year": self.lunar_date["year"],
+            "month": self.lunar_date["month"],
+            "day": self.lunar_date["day"],
+            "hour": self.lunar_date["hour"],
+            "gender": self.gender
+        }
+
+    @timed
+    def generate_chart_data(self, with_predictions: bool = True) -> Dict:
+        """生成命盘数据；with_predictions 为 False 时宫位预测留空，由调用方逐宫填充"""
         return {
             "ming_gong": self.calculate_ming_gong(),
             "main_stars": self.calculate_main_stars(),
-            "predictions": self.get_fortune_prediction(),
-            "birth_info": {
-                "year": self.lunar_date["year"],
-                "month": self.lunar_date["month"],
-                "day": self.lunar_date["day"],
-                "hour": self.lunar_date["hour"],
-                "gender": self.gender
-            }
-        }
\ No newline at end of file
+            "predictions": self.get_fortune_prediction() if with_predictions else {},
+            "birth_info": self.birth_info()
+        }
@@ -1,25 +1,38 @@
+from utils.metrics import timed
+from utils.shared_tables import get_table
+
+ZODIAC_ANIMALS = ["鼠", "牛", "虎", "兔", "龙", "蛇", "马", "羊", "猴", "鸡", "狗", "猪"]
+
+# Simplified compatibility scores (1-5 scale)
+COMPATIBILITY = {
+    "鼠": {"牛": 3, "虎": 4, "兔": 2, "龙": 5, "蛇": 3, "马": 2, "羊": 4, "猴": 4, "鸡": 2, "狗": 3, "猪": 5},
+    "牛": {"鼠": 3, "虎": 2, "兔": 4, "龙": 3, "蛇": 5, "马": 3, "羊": 2, "猴": 3, "鸡": 4, "狗": 4, "猪": 3},
+    "虎": {"鼠": 4, "牛": 2, "兔": 3, "龙": 5, "蛇": 2, "马": 4, "羊": 3, "猴": 2, "鸡": 3, "狗": 5, "猪": 3},
+    "兔": {"鼠": 2, "牛": 4, "虎": 3, "龙": 3, "蛇": 4, "马": 3, "羊": 5, "猴": 2, "鸡": 2, "狗": 4, "猪": 5},
+    "龙": {"鼠": 5, "牛": 3, "虎": 5, "兔": 3, "蛇": 4, "马": 3, "羊": 2, "猴": 4, "鸡": 4, "狗": 2, "猪": 3},
+    "蛇": {"鼠": 3, "牛": 5, "虎": 2, "兔": 4, "龙": 4, "马": 3, "羊": 4, "猴": 3, "鸡": 5, "狗": 2, "猪": 2},
+    "马": {"鼠": 2, "牛": 3, "虎": 4, "兔": 3, "龙": 3, "蛇": 3, "羊": 5, "猴": 3, "鸡": 3, "狗": 4, "猪": 2},
+    "羊": {"鼠": 4, "牛": 2, "虎": 3, "兔": 5, "龙": 2, "蛇": 4, "马": 5, "猴": 3, "鸡": 3, "狗": 3, "猪": 4},
+    "猴": {"鼠": 4, "牛": 3, "虎": 2, "兔": 2, "龙": 4, "蛇": 3, "马": 3, "羊": 3, "鸡": 4, "狗": 3, "猪": 3},
+    "鸡": {"鼠": 2, "牛": 4, "虎": 3, "兔": 2, "龙": 4, "蛇": 5, "马": 3, "羊": 3, "猴": 4, "狗": 2, "猪": 3},
+    "狗": {"鼠": 3, "牛": 4, "虎": 5, "兔": 4, "龙": 2, "蛇": 2, "马": 4, "羊": 3, "猴": 3, "鸡": 2, "猪": 4},
+    "猪": {"鼠": 5, "牛": 3, "虎": 3, "兔": 5, "龙": 3, "蛇": 2, "马": 2, "羊": 4, "猴": 3, "鸡": 3, "狗": 4}
+}
+
+
+@timed
 def get_zodiac_sign(year: int) -> str:
     """Get Chinese zodiac sign based on birth year."""
-    zodiac_animals = ["鼠", "牛", "虎", "兔", "龙", "蛇", "马", "羊", "猴", "鸡", "狗", "猪"]
-    return zodiac_animals[(year - 4) % 12]
+    return ZODIAC_ANIMALS[(year - 4) % 12]
 
+@timed
 def get_zodiac_compatibility(zodiac: str) -> dict:
     """Get zodiac sign compatibility scores."""
-    
-    # Simplified compatibility scores (1-5 scale)
-    compatibility_map = {
-        "鼠": {"牛": 3, "虎": 4, "兔": 2, "龙": 5, "蛇": 3, "马": 2, "羊": 4, "猴": 4, "鸡": 2, "狗": 3, "猪": 5},
-        "牛": {"鼠": 3, "虎": 2, "兔": 4, "龙": 3, "蛇": 5, "马": 3, "羊": 2, "猴": 3, "鸡": 4, "狗": 4, "猪": 3},
-        "虎": {"鼠": 4, "牛": 2, "兔": 3, "龙": 5, "蛇": 2, "马": 4, "羊": 3, "猴": 2, "鸡": 3, "狗": 5, "猪": 3},
-        "兔": {"鼠": 2, "牛": 4, "虎": 3, "龙": 3, "蛇": 4, "马": 3, "羊": 5, "猴": 2, "鸡": 2, "狗": 4, "猪": 5},
-        "龙": {"鼠": 5, "牛": 3, "虎": 5, "兔": 3, "蛇": 4, "马": 3, "羊": 2, "猴": 4, "鸡": 4, "狗": 2, "猪": 3},
-        "蛇": {"鼠": 3, "牛": 5, "虎": 2, "兔": 4, "龙": 4, "马": 3, "羊": 4, "猴": 3, "鸡": 5, "狗": 2, "猪": 2},
-        "马": {"鼠": 2, "牛": 3, "虎": 4, "兔": 3, "龙": 3, "蛇": 3, "羊": 5, "猴": 3, "鸡": 3, "狗": 4, "猪": 2},
-        "羊": {"鼠": 4, "牛": 2, "虎": 3, "兔": 5, "龙": 2, "蛇": 4, "马": 5, "猴": 3, "鸡": 3, "狗": 3, "猪": 4},
-        "猴": {"鼠": 4, "牛": 3, "虎": 2, "兔": 2, "龙": 4, "蛇": 3, "马": 3, "羊": 3, "鸡": 4, "狗": 3, "猪": 3},
-        "鸡": {"鼠": 2, "牛": 4, "虎": 3, "兔": 2, "龙": 4, "蛇": 5, "马": 3, "羊": 3, "猴": 4, "狗": 2, "猪": 3},
-        "狗": {"鼠": 3, "牛": 4, "虎": 5, "兔": 4, "龙": 2, "蛇": 2, "马": 4, "羊": 3, "猴": 3, "鸡": 2, "猪": 4},
-        "猪": {"鼠": 5, "牛": 3, "虎": 3, "兔": 5, "龙": 3, "蛇": 2, "马": 2, "羊": 4, "猴": 3, "鸡": 3, "狗": 4}
-    }
-    
-    return compatibility_map.get(zodiac, {})
+    if zodiac not in COMPATIBILITY:
+        return {}
+    # 请求路径上不等待表构建，构建期间直接用字典
+    table = get_table("zodiac_compatibility", block=False)
+    if table is None:
+        return dict(COMPATIBILITY[zodiac])
+    row = table[ZODIAC_ANIMALS.index(zodiac)]
+    return {other: int(row[j]) for j, other in enumerate(ZODIAC_ANIMALS) if other != zodiac}